@@ -9,6 +9,21 @@ Created on Mon Mar 10 16:58:26 2025
 """
 State management for the Nellie Napari plugin.
 """
+import atexit
+import os
+import time
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from utils.parsing import get_float_pos_comma
+
+try:
+    import pyarrow  # noqa: F401 - availability probe for Feather IO
+    _HAVE_PYARROW = True
+except ImportError:
+    _HAVE_PYARROW = False
+
 
 class AppState:
     def __init__(self):
@@ -22,6 +37,24 @@ class AppState:
         self.highlighted_layer = None
         self.node_path = None
         self.node_dataframe = None
+        # Deferred-save bookkeeping: edits mark the table dirty and
+        # save_if_dirty() coalesces rapid writes (see method below)
+        self.dirty = False
+        self._last_save = 0.0
+        # SoA views of the node table, rebuilt by rebuild_node_arrays():
+        # contiguous id/position arrays plus CSR neighbour lists so the
+        # edit paths never re-parse Position(ZXY)/Neighbour ID strings
+        self.node_ids_arr = None
+        self.node_positions_arr = None
+        self.neighbours_indptr = None
+        self.neighbours_indices = None
+        # cKDTree over node_positions_arr (rebuilt with the arrays)
+        self.node_kdtree = None
+        # Exact-match map tuple(rounded position) -> positional index
+        self.pos_to_iloc = {}
+        # Lazily built cKDTree over skeleton_coords (see property below)
+        self._skeleton_kdtree = None
+        self._skeleton_kdtree_src = None
         self.slider_images = []
         self.current_image_index = 0  # Current image index
         self.image_sets_keys = []
@@ -35,6 +68,26 @@ class AppState:
         self.dynamics_analysis_results = None
         # Skeleton coordinates for point insertion
         self.skeleton_coords = None
+        # Structure-of-arrays view of the skeleton layer (pos/rgba/kind)
+        self.skeleton_soa = None
+        # Full-resolution Extracted Nodes data (kept for decimation swaps)
+        self.full_node_positions = None
+        self.full_node_colors = None
+        # Amortized capacity-doubling buffer behind the Extracted Nodes
+        # layer data; only the first _points_len rows are live
+        self._points_buf = None
+        self._points_len = 0
+        # uint8 RGBA rows backing the layer's face_color, grown in
+        # lockstep with _points_buf
+        self._face_color_buf = None
+        # Cache of load_image_and_skeleton results keyed by output path
+        self.loaded_cache = {}
+        # Cache of rendered multigraph images keyed by extracted CSV path
+        self.graph_cache = {}
+        # Cache of solved graph layouts keyed by edge multiset
+        self.graph_layout_cache = {}
+        # Cache of graph QPixmaps keyed by (path, mtime)
+        self.graph_pixmap_cache = {}
         # Dimension resolutions (µm)
         self.z_resolution = 0.292
         self.y_resolution = 0.11
@@ -42,6 +95,8 @@ class AppState:
         # Dynamics analysis parameters
         self.distance_threshold = 5.0  # pixels - spatial matching threshold for nodes
         self.persistence_window = 1    # frames - validation window for events
+        # Cached [Z, Y, X] scale ndarray (invalidated when resolutions change)
+        self._visualization_scale = None
 
     @property
     def visualization_scale(self):
@@ -49,9 +104,133 @@ class AppState:
 
         Z is scaled relative to Y to account for anisotropic voxel sizes.
         Larger Z voxels need to be stretched in the display.
+
+        The ndarray is cached and reused across layer adds so napari does
+        not re-wrap a fresh list on every call.
         """
         z_scale = self.z_resolution / self.y_resolution if self.y_resolution > 0 else 1.0
-        return [z_scale, 1, 1]
+        if self._visualization_scale is None or self._visualization_scale[0] != z_scale:
+            self._visualization_scale = np.array([z_scale, 1.0, 1.0])
+        return self._visualization_scale
+
+    @property
+    def skeleton_kdtree(self):
+        """cKDTree over skeleton_coords, built lazily on first query.
+
+        The tree is cached against the coordinate array identity so it
+        is rebuilt automatically whenever a new skeleton is loaded.
+        """
+        coords = self.skeleton_coords
+        if coords is None or len(coords) == 0:
+            return None
+        if self._skeleton_kdtree_src is not coords:
+            self._skeleton_kdtree = cKDTree(coords)
+            self._skeleton_kdtree_src = coords
+        return self._skeleton_kdtree
+
+    def rebuild_node_arrays(self):
+        """Rebuild the SoA views of the node table.
+
+        Parses every Position(ZXY) and Neighbour ID string exactly once
+        and stores the results as a contiguous (N, 3) position array, an
+        id array and a CSR (indptr, indices) neighbour layout. Must be
+        called whenever node_dataframe is reloaded or edited; the edit
+        modules look positions up against these arrays instead of
+        re-parsing the whole column per click.
+        """
+        nd_pdf = self.node_dataframe
+        if nd_pdf is None or nd_pdf.empty or 'Position(ZXY)' not in nd_pdf.columns:
+            self.node_ids_arr = np.empty(0, dtype=np.int64)
+            self.node_positions_arr = np.empty((0, 3), dtype=np.float32)
+            self.neighbours_indptr = np.zeros(1, dtype=np.int64)
+            self.neighbours_indices = np.empty(0, dtype=np.int64)
+            self.node_kdtree = None
+            self.pos_to_iloc = {}
+            return
+
+        self.node_ids_arr = nd_pdf['Node ID'].to_numpy(dtype=np.int64)
+        # float32 C-contiguous to match the napari layer data, so the
+        # equality checks against layer positions never upcast/copy.
+        # Parsed in one vectorized pass over the column; the per-cell
+        # parser is only the fallback for ragged or malformed cells.
+        pos_cols = ['pos_z', 'pos_y', 'pos_x']
+        if (all(c in nd_pdf.columns for c in pos_cols)
+                and not nd_pdf[pos_cols].isna().to_numpy().any()):
+            # adjacency_to_extracted mirrors the coordinates into three
+            # numeric columns; rows appended by the edit paths only fill
+            # Position(ZXY), so these are trusted only while complete
+            self.node_positions_arr = np.ascontiguousarray(
+                nd_pdf[pos_cols].to_numpy(), dtype=np.float32)
+        else:
+            pos_col = nd_pdf['Position(ZXY)'].astype(str)
+            try:
+                tokens = (pos_col.str.replace(r'[\[\]\(\),]', ' ', regex=True)
+                                 .str.split())
+                self.node_positions_arr = np.ascontiguousarray(
+                    tokens.tolist(), dtype=np.float32)
+            except ValueError:
+                self.node_positions_arr = np.ascontiguousarray(
+                    [get_float_pos_comma(st) for st in pos_col],
+                    dtype=np.float32)
+
+        neighbour_lists = [self._parse_neighbour_cell(cell)
+                           for cell in nd_pdf['Neighbour ID']]
+        lengths = np.fromiter((len(l) for l in neighbour_lists),
+                              dtype=np.int64, count=len(neighbour_lists))
+        self.neighbours_indptr = np.concatenate(
+            (np.zeros(1, dtype=np.int64), np.cumsum(lengths)))
+        self.neighbours_indices = (
+            np.concatenate([np.asarray(l, dtype=np.int64) for l in neighbour_lists])
+            if lengths.sum() > 0 else np.empty(0, dtype=np.int64))
+        # O(log N) nearest-node lookups for the click handlers
+        self.node_kdtree = cKDTree(self.node_positions_arr)
+        # O(1) exact lookups for points that are already node positions
+        self.pos_to_iloc = {tuple(np.round(p, 6)): i
+                            for i, p in enumerate(self.node_positions_arr)}
+
+    @staticmethod
+    def _parse_neighbour_cell(cell):
+        """Parse one Neighbour ID cell, tolerating strings, sequences and NaN."""
+        if isinstance(cell, (list, tuple, np.ndarray)):
+            return [int(v) for v in cell]
+        if cell is None or (isinstance(cell, float) and np.isnan(cell)):
+            return []
+        cell = str(cell)
+        if cell == 'nan' or cell == '[]':
+            return []
+        return get_float_pos_comma(cell)
+
+    def save_if_dirty(self, force=False):
+        """Flush node_dataframe to its CSV when marked dirty.
+
+        Serializing the whole table per click dominated edit latency, so
+        edits only set ``dirty`` and call this; writes within one second
+        of the previous one are coalesced. Anything that re-reads the
+        CSV from disk (the loader, graph generation) must pass
+        ``force=True`` first so the file is never stale when read.
+        """
+        if not self.dirty or self.node_dataframe is None or self.node_path is None:
+            return
+        if not force and (time.time() - self._last_save) < 1.0:
+            return
+        self.node_dataframe.to_csv(self.node_path, index=False)
+        # Also write a Feather sidecar when pyarrow is available: the
+        # loader prefers it since it skips CSV parsing and keeps the
+        # neighbour lists as native list columns. The CSV stays the
+        # canonical interchange format for the graph step and R scripts.
+        if _HAVE_PYARROW:
+            try:
+                self.node_dataframe.reset_index(drop=True).to_feather(
+                    os.path.splitext(self.node_path)[0] + '.feather')
+            except Exception:
+                pass
+        self.dirty = False
+        self._last_save = time.time()
+
+    def node_neighbours(self, iloc):
+        """Neighbour IDs of the node at positional index ``iloc``."""
+        return self.neighbours_indices[
+            self.neighbours_indptr[iloc]:self.neighbours_indptr[iloc + 1]]
 
     def reset(self):
         """Reset all state variables to their initial values.
@@ -68,6 +247,15 @@ class AppState:
         self.highlighted_layer = None
         self.node_path = None
         self.node_dataframe = None
+        self.dirty = False
+        self.node_ids_arr = None
+        self.node_positions_arr = None
+        self.neighbours_indptr = None
+        self.neighbours_indices = None
+        self.node_kdtree = None
+        self.pos_to_iloc = {}
+        self._skeleton_kdtree = None
+        self._skeleton_kdtree_src = None
         self.slider_images = []
         self.current_image_index = 0
         self.image_sets_keys = []
@@ -79,5 +267,19 @@ class AppState:
         self.dynamics_events = None
         self.dynamics_analysis_results = None
         self.skeleton_coords = None
+        self.skeleton_soa = None
+        self.full_node_positions = None
+        self.full_node_colors = None
+        self._points_buf = None
+        self._points_len = 0
+        self._face_color_buf = None
+        self.loaded_cache = {}
+        self.graph_cache = {}
+        self.graph_layout_cache = {}
+        self.graph_pixmap_cache = {}
+
+app_state = AppState()
 
-app_state = AppState()
\ No newline at end of file
+# Edits deferred inside the debounce window must not be lost when the
+# application closes; flush whatever is still pending on exit
+atexit.register(lambda: app_state.save_if_dirty(force=True))
\ No newline at end of file
@@ -2,19 +2,67 @@ from app_state import app_state
 from utils.layer_loader import load_image_and_skeleton, load_dynamics_events_layer
 from natsort import natsorted
 import os
-from modifying_topology.edit_node import highlight
-from modifying_topology.add_edge import join
-from tifffile import imread
-from modifying_topology.remove_edge import remove
-from modifying_topology.insert_node import insert_node_at_cursor, toggle_preview_mode, toggle_z_lock
-from modifying_topology.remove_node import remove_node
+from functools import partial, wraps
+from napari.layers import Image
 import numpy as np
 
+from qtpy.QtCore import QTimer
 from qtpy.QtWidgets import (
-    QCheckBox, QComboBox, QFormLayout, QGroupBox, 
-QLabel, QPushButton, QSpinBox, QTextEdit, 
+    QCheckBox, QComboBox, QFormLayout, QGroupBox,
+QLabel, QPushButton, QSpinBox, QTextEdit,
 QVBoxLayout, QHBoxLayout, QWidget, QFileDialog)
 
+# Decimation settings for the Extracted Nodes layer: above this node count
+# and below this camera zoom, only a subsample of points is displayed
+DECIMATION_THRESHOLD = 10000
+DECIMATION_ZOOM = 1.0
+
+# Debounce timer so decimation swaps once zooming settles
+_zoom_debounce_timer = None
+
+
+def _decimated_node_data(viewer):
+    """Return (positions, colors) for the Extracted Nodes layer, subsampled
+    when the node count is large and the camera is zoomed out."""
+    positions = app_state.full_node_positions
+    colors = app_state.full_node_colors
+    if positions is None:
+        return None, None
+    if len(positions) > DECIMATION_THRESHOLD and viewer.camera.zoom < DECIMATION_ZOOM:
+        k = max(1, len(positions) // DECIMATION_THRESHOLD)
+        return positions[::k], colors[::k]
+    return positions, colors
+
+
+def _update_node_decimation(viewer):
+    """Swap the Extracted Nodes layer between decimated and full data."""
+    # Resolve the layer by name: app_state.points_layer is repointed at
+    # the temporary 'Connected Nodes' layer while a highlight is shown,
+    # and writing the node cloud into that layer would clobber it
+    if 'Extracted Nodes' not in viewer.layers:
+        return
+    points_layer = viewer.layers['Extracted Nodes']
+    positions, colors = _decimated_node_data(viewer)
+    if positions is None or len(positions) == len(points_layer.data):
+        return
+    points_layer.data = positions
+    points_layer.face_color = colors
+
+
+def _on_camera_zoom(viewer):
+    """Debounced camera-zoom handler driving node decimation."""
+    global _zoom_debounce_timer
+    if _zoom_debounce_timer is None:
+        _zoom_debounce_timer = QTimer()
+        _zoom_debounce_timer.setSingleShot(True)
+        _zoom_debounce_timer.setInterval(150)
+    try:
+        _zoom_debounce_timer.timeout.disconnect()
+    except (TypeError, RuntimeError):
+        pass
+    _zoom_debounce_timer.timeout.connect(lambda: _update_node_decimation(viewer))
+    _zoom_debounce_timer.start()
+
 
 class ViewerState:
     """Class to store and restore viewer state"""
@@ -32,53 +80,160 @@ class ViewerState:
         self.camera_angles = viewer.camera.angles
         
         # Capture contrast limits and visibility for each layer
+        # (isinstance is cheaper than hasattr and only Image layers here
+        # carry contrast limits)
         for layer in viewer.layers:
-            if hasattr(layer, 'contrast_limits'):
+            if isinstance(layer, Image):
                 self.contrast_limits[layer.name] = layer.contrast_limits
             self.layer_visibility[layer.name] = layer.visible
             
     def restore_state(self, viewer):
         """Restore viewer state"""
-        if self.camera_center is not None:
-            viewer.camera.center = self.camera_center
-        if self.camera_zoom is not None:
-            viewer.camera.zoom = self.camera_zoom
-        if self.camera_angles is not None:
-            viewer.camera.angles = self.camera_angles
-            
-        # Restore contrast limits and visibility
-        for layer in viewer.layers:
-            if layer.name in self.contrast_limits and hasattr(layer, 'contrast_limits'):
-                layer.contrast_limits = self.contrast_limits[layer.name]
-            if layer.name in self.layer_visibility:
-                layer.visible = self.layer_visibility[layer.name]
+        # Set all camera attributes inside one event blocker so vispy
+        # redraws once instead of once per assignment
+        with viewer.camera.events.blocker_all():
+            if self.camera_center is not None:
+                viewer.camera.center = self.camera_center
+            if self.camera_zoom is not None:
+                viewer.camera.zoom = self.camera_zoom
+            if self.camera_angles is not None:
+                viewer.camera.angles = self.camera_angles
+        viewer.camera.events.angles()  # one consolidated refresh
+
+        # Restore contrast limits and visibility in a single batch
+        with viewer.layers.events.blocker_all():
+            for layer in viewer.layers:
+                if layer.name in self.contrast_limits and isinstance(layer, Image):
+                    layer.contrast_limits = self.contrast_limits[layer.name]
+                if layer.name in self.layer_visibility:
+                    layer.visible = self.layer_visibility[layer.name]
 
 
 # Global viewer state instance
 viewer_state = ViewerState()
 
 
+def _node_csv_mtime(node_path):
+    """Return the node CSV mtime, or None when no CSV exists yet."""
+    if node_path and os.path.exists(node_path):
+        return os.path.getmtime(node_path)
+    return None
+
+
+def cached_load_image_and_skeleton(nellie_output_path):
+    """load_image_and_skeleton backed by app_state.loaded_cache.
+
+    Entries are keyed by output path and validated against the node CSV
+    mtime, so topology edits (which rewrite the CSV) force a fresh load
+    while revisiting an unchanged folder is served from memory instead of
+    re-reading the TIFFs.
+    """
+    # Deferred edits must hit the disk before the mtime check below,
+    # otherwise a stale file would validate a stale cache entry
+    app_state.save_if_dirty(force=True)
+    entry = app_state.loaded_cache.get(nellie_output_path)
+    if entry is not None:
+        node_path, mtime, node_dataframe, skeleton_coords, skeleton_soa, loaded = entry
+        if _node_csv_mtime(node_path) == mtime:
+            # Restore the loader's app_state side effects for this folder
+            app_state.nellie_output_path = nellie_output_path
+            app_state.node_path = node_path
+            app_state.node_dataframe = node_dataframe
+            app_state.skeleton_coords = skeleton_coords
+            # The SoA must follow the skeleton it describes, and the SoA
+            # node arrays must follow the restored table; otherwise the
+            # edit paths recolour arrays from the previous timepoint
+            app_state.skeleton_soa = skeleton_soa
+            app_state.rebuild_node_arrays()
+            # Force the insert path to reseed its append buffers against
+            # the restored layer data rather than the previous folder's
+            app_state._points_buf = None
+            app_state._points_len = 0
+            app_state._face_color_buf = None
+            return loaded
+
+    loaded = load_image_and_skeleton(nellie_output_path)
+    app_state.loaded_cache[nellie_output_path] = (
+        app_state.node_path,
+        _node_csv_mtime(app_state.node_path),
+        app_state.node_dataframe,
+        app_state.skeleton_coords,
+        app_state.skeleton_soa,
+        loaded,
+    )
+    return loaded
+
+
 def reload_visualization_with_state_preservation(widget):
     """Reload the visualization after modifications while preserving viewer state"""
     # Capture current state before clearing
     viewer_state.capture_state(widget.viewer)
-    
+
     # Reload the visualization
     reload_visualization(widget)
-    
+
     # Restore the captured state
     viewer_state.restore_state(widget.viewer)
 
 
-def reload_visualization(widget):
-    """Reload the visualization after modifications"""
-    widget.viewer.layers.clear()
-    raw_im, skel_im, face_colors, positions, colors, edge_lines = load_image_and_skeleton(
-        app_state.nellie_output_path
-    )
+def _update_layers_in_place(widget, raw_im, skel_im, face_colors, positions, colors):
+    """Update the existing layers' data instead of clearing and re-adding.
+
+    Assigning .data keeps the GPU buffers alive rather than tearing down
+    and re-meshing three layers per edit. Returns False when the expected
+    layers are missing (first view, or the node layer appearing or
+    disappearing), in which case the caller should do a full rebuild.
+    """
+    viewer = widget.viewer
+    if 'Raw Image' not in viewer.layers or 'Skeleton' not in viewer.layers:
+        return False
+    has_nodes = len(positions) > 0 and len(colors) > 0
+    if has_nodes != ('Extracted Nodes' in viewer.layers):
+        return False
+
+    with viewer.layers.events.blocker_all():
+        viewer.layers['Raw Image'].data = raw_im
+        skeleton_layer = viewer.layers['Skeleton']
+        skeleton_layer.data = skel_im
+        skeleton_layer.face_color = face_colors
+        if has_nodes:
+            app_state.full_node_positions = np.asarray(positions)
+            app_state.full_node_colors = np.asarray(colors)
+            dec_positions, dec_colors = _decimated_node_data(viewer)
+            points_layer = viewer.layers['Extracted Nodes']
+            points_layer.data = dec_positions
+            points_layer.face_color = dec_colors
+            app_state.points_layer = points_layer
+        # Force the insert path to reseed its append buffers: an
+        # in-place reload can change colours without changing the point
+        # count, which the buffer's length check alone cannot detect
+        app_state._points_buf = None
+        app_state._points_len = 0
+        app_state._face_color_buf = None
+        # Drop the stale highlight layer; a full clear used to remove it
+        if 'Connected Nodes' in viewer.layers:
+            viewer.layers.remove('Connected Nodes')
+    return True
+
+
+def reload_visualization(widget, preloaded=None):
+    """Reload the visualization after modifications.
+
+    Args:
+        preloaded: Optional tuple from load_image_and_skeleton to reuse,
+                   avoiding a second load of the same folder
+    """
+    if preloaded is None:
+        preloaded = cached_load_image_and_skeleton(app_state.nellie_output_path)
+    raw_im, skel_im, face_colors, positions, colors, edge_lines = preloaded
 
     if raw_im is not None and skel_im is not None:
+        if _update_layers_in_place(widget, raw_im, skel_im, face_colors, positions, colors):
+            return
+        widget.viewer.layers.clear()
         add_image_layers(widget, raw_im, skel_im, face_colors, positions, colors, edge_lines)
+    else:
+        widget.viewer.layers.clear()
 
 
 def add_image_layers(widget, raw_im, skel_im, face_colors, positions, colors, edge_lines):
@@ -99,16 +254,27 @@ def add_image_layers(widget, raw_im, skel_im, face_colors, positions, colors, ed
         name='Skeleton'
     )
 
-    # Add extracted nodes if available
-    if positions and colors:
+    # Add extracted nodes if available (decimated when the count is large
+    # and the view is zoomed out; full data is cached for zoom-in swaps)
+    if len(positions) > 0 and len(colors) > 0:
+        app_state.full_node_positions = np.asarray(positions)
+        app_state.full_node_colors = np.asarray(colors)
+        dec_positions, dec_colors = _decimated_node_data(widget.viewer)
+
         app_state.points_layer = widget.viewer.add_points(
-            positions,
+            dec_positions,
             size=5,
-            face_color=colors,
+            face_color=dec_colors,
             scale=app_state.visualization_scale,
             name='Extracted Nodes'
         )
 
+        if not getattr(widget, '_zoom_callback_setup', False):
+            widget.viewer.camera.events.zoom.connect(
+                lambda event: _on_camera_zoom(widget.viewer)
+            )
+            widget._zoom_callback_setup = True
+
     # Add dynamics events layer if available
     if hasattr(widget, 'image_slider'):
         current_timepoint = widget.image_slider.value()
@@ -117,48 +283,52 @@ def add_image_layers(widget, raw_im, skel_im, face_colors, positions, colors, ed
 
 def setup_key_bindings(widget, viewer):
     """Setup key bindings for the viewer"""
+    # Deferred imports: the editing modules are only needed once a key is
+    # actually bound, keeping cold import of this module cheap
+    from modifying_topology.edit_node import highlight
+    from modifying_topology.add_edge import join
+    from modifying_topology.remove_edge import remove
+    from modifying_topology.insert_node import insert_node_at_cursor, toggle_preview_mode, toggle_z_lock
+    from modifying_topology.remove_node import remove_node
+
+    def _require_nodes(count=None, message=None):
+        """Decorator: only run a handler when the Extracted Nodes layer exists
+        and the selection matches (exactly `count` nodes, or any non-empty
+        selection when `count` is None)."""
+        def decorator(handler):
+            @wraps(handler)
+            def wrapped(viewer):
+                if 'Extracted Nodes' not in viewer.layers:
+                    widget.log_status("Extracted Nodes layer not found.")
+                    return
+                n_selected = len(viewer.layers['Extracted Nodes'].selected_data)
+                if count is None:
+                    if n_selected == 0:
+                        widget.log_status("No node selected to edit.")
+                        return
+                elif n_selected != count:
+                    widget.log_status(message)
+                    return
+                return handler(viewer)
+            return wrapped
+        return decorator
 
     @viewer.bind_key('e')
+    @_require_nodes()
     def edit(viewer):
-        # Get Extracted Nodes layer by name
-        if 'Extracted Nodes' not in viewer.layers:
-            widget.log_status("Extracted Nodes layer not found.")
-            return
-        extracted_layer = viewer.layers['Extracted Nodes']
-
-        if len(list(extracted_layer.selected_data)) == 0:
-            widget.log_status("No node selected to edit.")
-            return
         highlight(viewer, widget)
 
     @viewer.bind_key('u')
+    @_require_nodes()
     def unseen(viewer):
-        # Get Extracted Nodes layer by name
-        if 'Extracted Nodes' not in viewer.layers:
-            widget.log_status("Extracted Nodes layer not found.")
-            return
-        extracted_layer = viewer.layers['Extracted Nodes']
-
-        if len(list(extracted_layer.selected_data)) == 0:
-            widget.log_status("No node selected to edit.")
-            return
-        if 'Connected Nodes' in [layer.name for layer in viewer.layers]:
+        if 'Connected Nodes' in viewer.layers:
             viewer.layers.remove('Connected Nodes')
         app_state.editable_node_positions = []
         app_state.selected_node_position = []
 
     @viewer.bind_key('j')
+    @_require_nodes(count=2, message="Need to select exactly 2 nodes to join.")
     def join_points(viewer):
-        # Get Extracted Nodes layer by name
-        if 'Extracted Nodes' not in viewer.layers:
-            widget.log_status("Extracted Nodes layer not found.")
-            return
-        extracted_layer = viewer.layers['Extracted Nodes']
-
-        if len(list(extracted_layer.selected_data)) != 2:
-            widget.log_status("Need to select exactly 2 nodes to join.")
-            return
-
         try:
             join(viewer)
             reload_visualization_with_state_preservation(widget)
@@ -167,17 +337,8 @@ def setup_key_bindings(widget, viewer):
             widget.log_status(f"Error joining nodes: {str(e)}")
 
     @viewer.bind_key('r')
+    @_require_nodes(count=2, message="Need to select exactly 2 nodes to remove.")
     def remove_edge(viewer):
-        # Get Extracted Nodes layer by name
-        if 'Extracted Nodes' not in viewer.layers:
-            widget.log_status("Extracted Nodes layer not found.")
-            return
-        extracted_layer = viewer.layers['Extracted Nodes']
-
-        if len(list(extracted_layer.selected_data)) != 2:
-            widget.log_status("Need to select exactly 2 nodes to remove.")
-            return
-
         try:
             flag = remove(viewer)
             if flag:
@@ -205,6 +366,12 @@ def setup_key_bindings(widget, viewer):
     def remove_node_key(viewer):
         remove_node(viewer, widget)
 
+    @viewer.bind_key('Control-s')
+    def save_now(viewer):
+        """Flush pending node-table edits to disk (key: 'Ctrl+s')"""
+        app_state.save_if_dirty(force=True)
+        widget.log_status("Node table saved.")
+
     # ========== Dynamic Event Correction Keybindings ==========
     from dynamics.manual_event_correction import (
         delete_selected_event, show_event_info,
@@ -226,47 +393,14 @@ def setup_key_bindings(widget, viewer):
             show_event_info(viewer, widget, current_tp)
 
     # Keybindings for adding specific event types (1-6)
-    @viewer.bind_key('1')
-    def add_tip_edge_fusion(viewer):
-        """Add tip-edge fusion event at cursor (key: '1')"""
+    def _add_event(viewer, event_type_key):
+        """Add an event of the given type at cursor (keys: '1'-'6')"""
         if hasattr(widget, 'image_slider'):
             current_tp = widget.image_slider.value()
-            add_event_at_cursor(viewer, widget, 'tip_edge_fusion', current_tp)
+            add_event_at_cursor(viewer, widget, event_type_key, current_tp)
 
-    @viewer.bind_key('2')
-    def add_junction_breakage(viewer):
-        """Add junction breakage event at cursor (key: '2')"""
-        if hasattr(widget, 'image_slider'):
-            current_tp = widget.image_slider.value()
-            add_event_at_cursor(viewer, widget, 'junction_breakage', current_tp)
-
-    @viewer.bind_key('3')
-    def add_tip_tip_fusion(viewer):
-        """Add tip-tip fusion event at cursor (key: '3')"""
-        if hasattr(widget, 'image_slider'):
-            current_tp = widget.image_slider.value()
-            add_event_at_cursor(viewer, widget, 'tip_tip_fusion', current_tp)
-
-    @viewer.bind_key('4')
-    def add_tip_tip_fission(viewer):
-        """Add tip-tip fission event at cursor (key: '4')"""
-        if hasattr(widget, 'image_slider'):
-            current_tp = widget.image_slider.value()
-            add_event_at_cursor(viewer, widget, 'tip_tip_fission', current_tp)
-
-    @viewer.bind_key('5')
-    def add_extrusion(viewer):
-        """Add extrusion event at cursor (key: '5')"""
-        if hasattr(widget, 'image_slider'):
-            current_tp = widget.image_slider.value()
-            add_event_at_cursor(viewer, widget, 'extrusion', current_tp)
-
-    @viewer.bind_key('6')
-    def add_retraction(viewer):
-        """Add retraction event at cursor (key: '6')"""
-        if hasattr(widget, 'image_slider'):
-            current_tp = widget.image_slider.value()
-            add_event_at_cursor(viewer, widget, 'retraction', current_tp)
+    for key, event_type_key in zip('123456', EVENT_TYPES):
+        viewer.bind_key(key)(partial(_add_event, event_type_key=event_type_key))
 
 
 def update_image(widget, viewer, current, index):
@@ -290,9 +424,10 @@ def update_image(widget, viewer, current, index):
         subdir = subdirs[index]
         
         if int(subdir) > 0:
+            # Build the output path once and stat it once per slider tick
             subdir_path = os.path.join(app_state.loaded_folder, subdir)
-            check_nellie_path = os.path.exists(os.path.join(subdir_path, 'nellie_output/nellie_necessities'))
-            nellie_op_path = os.path.join(subdir_path, 'nellie_output/nellie_necessities')
+            nellie_op_path = os.path.join(subdir_path, 'nellie_output', 'nellie_necessities')
+            check_nellie_path = os.path.isdir(nellie_op_path)
             app_state.nellie_output_path = nellie_op_path
         
             if check_nellie_path:
@@ -300,8 +435,8 @@ def update_image(widget, viewer, current, index):
                 if len(widget.viewer.layers) > 0:
                     viewer_state.capture_state(widget.viewer)
 
-                # Load images
-                raw_im, skel_im, face_colors, positions, colors, edge_lines = load_image_and_skeleton(
+                # Load images (cached across the edit-then-refresh cycle)
+                raw_im, skel_im, face_colors, positions, colors, edge_lines = cached_load_image_and_skeleton(
                     app_state.nellie_output_path
                 )
 
@@ -314,12 +449,7 @@ def update_image(widget, viewer, current, index):
                     
                     # Restore viewer state after loading new image
                     viewer_state.restore_state(widget.viewer)
-                    
-                    # Setup key bindings (only once per session to avoid rebinding)
-                    if not hasattr(widget, '_key_bindings_setup'):
-                        setup_key_bindings(widget, viewer)
-                        widget._key_bindings_setup = True
-                    
+
                     widget.log_status(f"Visualization for {nellie_op_path} loaded successfully")
                     widget.network_btn.setEnabled(True)
                 
@@ -336,7 +466,14 @@ def update_image(widget, viewer, current, index):
                     if len(widget.viewer.layers) > 0:
                         viewer_state.capture_state(widget.viewer)
                     
-                    raw_im = imread(raw_im_path)
+                    # Memory-map uncompressed TIFFs so only the displayed
+                    # slices are paged in while scrubbing; fall back to a
+                    # full read for compressed/tiled files
+                    from tifffile import imread, memmap
+                    try:
+                        raw_im = memmap(raw_im_path)
+                    except (ValueError, OSError):
+                        raw_im = imread(raw_im_path)
                        
                     # Clear existing layers
                     widget.viewer.layers.clear()
@@ -1,6 +1,7 @@
 import napari
 from napari.utils.notifications import show_warning
 from gui.gui_layout_and_process import FileLoaderWidget
+from gui.update_display_mod import setup_key_bindings
 
 def load_viewer() -> napari.Viewer:
     """Load the viewer."""
@@ -9,4 +10,9 @@ def load_viewer() -> napari.Viewer:
     file_loader = FileLoaderWidget(viewer)
     viewer.window.add_dock_widget(file_loader, area='right', name="Nellie Controls")
 
+    # Bind all annotation keys once at startup; the handlers read live
+    # state from the viewer/app_state, so rebinding on every view click
+    # would only churn the keymap and reallocate the closures
+    setup_key_bindings(file_loader, viewer)
+
     return viewer
\ No newline at end of file
@@ -4,17 +4,23 @@ import os
 import numpy as np
 import pandas as pd
 import networkx as nx
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.lines import Line2D
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.patches import FancyArrowPatch
 from qtpy.QtGui import QPixmap, QImage
-from qtpy.QtCore import Qt
+from qtpy.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, Signal
 from qtpy.QtWidgets import QLabel
 
-def make_multigraph_image(widget,extracted_data_path,base_name,scale_factor=1.0):
+# kamada_kawai_layout is O(N^2); above this node count use spring layout
+KAMADA_KAWAI_MAX_NODES = 500
+
+def make_multigraph_image(widget,extracted_data_path,base_name,scale_factor=1.0,dpi=150,output_format='png'):
     """
     Visualize a multigraph from an adjacency list CSV file with proper handling of parallel edges.
     Includes node numbers for better identification.
-    
+
     Parameters:
     -----------
     adjacency_path : str
@@ -23,85 +29,128 @@ def make_multigraph_image(widget,extracted_data_path,base_name,scale_factor=1.0)
         Path where the output image will be saved
     scale_factor : float, optional
         Scale factor to apply to the graph (default: 1.0)
-        
+    dpi : int, optional
+        Raster resolution for PNG output (default: 150; use 300 for print quality)
+    output_format : str, optional
+        'png' or 'svg'; SVG skips Agg rasterization entirely (default: 'png')
+
     Returns:
     --------
     bool
         True if visualization succeeded, False otherwise
     """
     try:
-        
-        output_path = os.path.join(app_state.nellie_output_path, base_name+'_multigraph.png')
+
+        output_path = os.path.join(app_state.nellie_output_path, base_name+'_multigraph.'+output_format)
         # Check if input file exists
         
         if not os.path.exists(extracted_data_path):
             widget.log_status(f"Error: Input file does not exist: {extracted_data_path}")
             return False
-        else:
-            widget.log_status(f"Making Multigraph for: {extracted_data_path}")
 
-        # Read the extracted list CSV data
-        ext_data = pd.read_csv(extracted_data_path)
+        # If the CSV is unchanged since the last render and the output
+        # image still exists, the whole read/layout/savefig pipeline can
+        # be skipped — repeat views cost a single stat() call
+        csv_mtime = os.path.getmtime(extracted_data_path)
+        cached = app_state.graph_cache.get(extracted_data_path)
+        if cached is not None and cached[0] == csv_mtime and os.path.exists(cached[1]):
+            app_state.graph_image_path = cached[1]
+            widget.log_status(f"Graph unchanged, reusing: {cached[1]}")
+            return True
+
+        widget.log_status(f"Making Multigraph for: {extracted_data_path}")
+
+        # Read only the three columns the graph needs, with explicit
+        # dtypes so pandas skips its type-inference pass over the file
+        ext_data = pd.read_csv(
+            extracted_data_path,
+            usecols=['Node ID', 'Position(ZXY)', 'Neighbour ID'],
+            dtype={'Node ID': np.int64,
+                   'Position(ZXY)': 'string',
+                   'Neighbour ID': 'string'},
+            engine='c')
         
         # Create a MultiGraph to properly track parallel edges
         G = nx.MultiGraph()
         
-        # Add all nodes with their positions (helpful for layout)
-        for _, row in ext_data.iterrows():
-            G.add_node(row['Node ID'], 
-                    pos_x=get_float_pos_comma(row['Position(ZXY)'])[1], 
-                    pos_y=get_float_pos_comma(row['Position(ZXY)'])[2], 
-                    pos_z=get_float_pos_comma(row['Position(ZXY)'])[0],
-            )
-        
-        # Add edges and track multiplicity
-        edge_count = {}  # This should be a dictionary, not an int
-        for _, row in ext_data.iterrows():
-            node_id = row['Node ID']
-            adj_list = get_float_pos_comma(row['Neighbour ID'])
-            edge_count_temp = {}
-            for neighbor in adj_list:
-                # Also track for statistics
-                if tuple(sorted([node_id, neighbor])) not in edge_count.keys():
-                    edge_key = tuple(sorted([node_id, neighbor]))
-                    if edge_key in edge_count_temp:
-                        edge_count_temp[edge_key] += 1
-                    else:
-                        edge_count_temp[edge_key] = 1
-
-            for edge_key in edge_count_temp.keys():
-                for i in range(edge_count_temp[edge_key]): G.add_edge(edge_key[0], edge_key[1])
-                edge_count[edge_key] = edge_count_temp[edge_key]
+        # Pull each column out of the DataFrame exactly once; everything
+        # below works on these arrays so no per-row Series are built
+        node_ids = ext_data['Node ID'].to_numpy()
+        node_positions = ext_data['Position(ZXY)'].map(get_float_pos_comma)
+        neighbour_lists = ext_data['Neighbour ID'].map(get_float_pos_comma)
+
+        # Add all nodes with their positions (helpful for layout).
+        # Each position string is parsed exactly once instead of three
+        # times per row.
+        G.add_nodes_from(
+            (node_id, {'pos_x': pos[1], 'pos_y': pos[2], 'pos_z': pos[0]})
+            for node_id, pos in zip(node_ids, node_positions)
+        )
+
+        # Add edges and track multiplicity. The adjacency lists are
+        # expanded into one flat (u, v) pair array and counted with a
+        # single np.unique instead of per-row Python dict merges.
+        edge_count = {}
+        lengths = neighbour_lists.map(len).to_numpy()
+        if lengths.sum() > 0:
+            u = np.repeat(node_ids, lengths)
+            v = np.concatenate(neighbour_lists.tolist())
+            pairs = np.sort(np.stack([u, v], axis=1), axis=1).astype(int)
+            unique_pairs, counts = np.unique(pairs, axis=0, return_counts=True)
+            # Each undirected edge appears in both endpoints' adjacency
+            # lists, so halve the counts (self-loops only appear once)
+            counts = np.where(unique_pairs[:, 0] == unique_pairs[:, 1],
+                              counts, np.maximum(counts // 2, 1))
+            edges = []
+            for (n1, n2), count in zip(unique_pairs.tolist(), counts.tolist()):
+                edge_count[(n1, n2)] = count
+                edges.extend([(n1, n2)] * count)
+            G.add_edges_from(edges)
 
        # Calculate node degrees (from the multigraph to count parallel edges)
         node_degrees = dict(G.degree())
         
-        # Set up the plot with high resolution
-        fig = plt.figure(figsize=(13.33, 10), dpi=300)
-        ax = plt.gca()
-        # Use a specialized layout algorithm for reducing edge crossings
-        try:
-            # First try kamada_kawai which often gives better layouts with fewer crossings
-            layout = nx.kamada_kawai_layout(G, scale=scale_factor)
-        
-        except:
-            # Fall back to spring layout if kamada_kawai fails
-            layout = nx.spring_layout(
-                G, 
-                k=0.3 / np.sqrt(len(G.nodes())) * scale_factor,
-                iterations=1000,
-                seed=42
-            )
-        
-        # Node colors based on degree
-        node_colors = []
-        for node in G.nodes():
-            if node_degrees[node] == 1:
-                node_colors.append('blue')  # Endpoints
-            elif node_degrees[node] >= 3:
-                node_colors.append('red')   # Junctions
+        # Set up the plot with high resolution. The Figure is built
+        # directly on the Agg canvas instead of going through pyplot so
+        # no figure-manager state is registered against the Qt event
+        # loop and the Figure is reclaimed by plain garbage collection
+        fig = Figure(figsize=(13.33, 10), dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        # Use a specialized layout algorithm for reducing edge crossings.
+        # kamada_kawai gives fewer crossings but is O(N^2) per iteration,
+        # so it is reserved for small graphs; solved layouts are cached
+        # keyed on the edge multiset so re-visualizing an unchanged graph
+        # skips the solve entirely.
+        layout_key = (frozenset(edge_count.items()), len(G), scale_factor)
+        layout = app_state.graph_layout_cache.get(layout_key)
+        if layout is None:
+            if len(G) < KAMADA_KAWAI_MAX_NODES:
+                try:
+                    layout = nx.kamada_kawai_layout(G, scale=scale_factor)
+                except:
+                    # Fall back to spring layout if kamada_kawai fails
+                    layout = nx.spring_layout(
+                        G,
+                        k=0.3 / np.sqrt(len(G.nodes())) * scale_factor,
+                        iterations=1000,
+                        seed=42
+                    )
             else:
-                node_colors.append('lightblue')  # Other nodes
+                layout = nx.spring_layout(
+                    G,
+                    k=0.3 / np.sqrt(len(G.nodes())) * scale_factor,
+                    iterations=100,
+                    seed=42
+                )
+            app_state.graph_layout_cache[layout_key] = layout
+        
+        # Node colors based on degree, classified in one vectorized pass:
+        # endpoints (deg 1) blue, junctions (deg 3+) red, others lightblue
+        deg_arr = np.fromiter((node_degrees[n] for n in G.nodes()),
+                              dtype=np.int32, count=len(G))
+        node_colors = np.where(deg_arr == 1, 'blue',
+                               np.where(deg_arr >= 3, 'red', 'lightblue'))
         
         # Draw nodes
         node_size = max(5, 15 / scale_factor) * 25
@@ -111,45 +160,42 @@ def make_multigraph_image(widget,extracted_data_path,base_name,scale_factor=1.0)
             node_color=node_colors,
             node_size=node_size,
             edgecolors='black',
-            linewidths=1.5
+            linewidths=1.5,
+            ax=ax
         )
         
         # Draw all edges with appropriate curves for parallel edges
         edge_width = max(0.5, 1.5/scale_factor)
         
-        # Now draw each group of edges
-        for edge_key in edge_count.keys():
-            u, v = edge_key
-            num_edges = edge_count[edge_key]
-
+        # Batch the edge drawing: straight single edges go into one
+        # LineCollection and curved parallel edges into one
+        # PatchCollection, instead of one matplotlib Artist per edge
+        straight_segments = []
+        curved_patches = []
+        for (u, v), num_edges in edge_count.items():
             if num_edges == 1:
                 # Single edge - draw straight
-                nx.draw_networkx_edges(
-                    G,
-                    layout,
-                    edgelist=[(u, v)],
-                    width=edge_width,
-                    edge_color='gray'
-                )
+                straight_segments.append([layout[u], layout[v]])
             else:
                 # Multiple parallel edges - draw curved with different curvature values
                 max_curve = 0.3 * min(1, np.sqrt(num_edges) / 5)
-                
-                if num_edges % 2 == 0:  # Even number
-                    curves = np.linspace(-max_curve, max_curve, num_edges)
-                else:  # Odd number with one straight edge
-                    curves = np.linspace(-max_curve, max_curve, num_edges)
-                
-                for i in range(num_edges):
-                    ax.annotate("", 
-                                xy=layout[u], xycoords='data',
-                                xytext=layout[v], textcoords='data',
-                                arrowprops=dict(
-                                arrowstyle="-", 
-                                color='gray',  # You can replace with your color scheme
-                                connectionstyle=f"arc3,rad={curves[i]}",
-                                linewidth=edge_width  # Using the edge_width from your first snippet
-                            ))
+                curves = np.linspace(-max_curve, max_curve, num_edges)
+
+                for rad in curves:
+                    curved_patches.append(FancyArrowPatch(
+                        layout[u], layout[v],
+                        arrowstyle="-",
+                        connectionstyle=f"arc3,rad={rad}",
+                        color='gray',
+                        linewidth=edge_width
+                    ))
+
+        if straight_segments:
+            ax.add_collection(LineCollection(
+                straight_segments, colors='gray', linewidths=edge_width
+            ))
+        if curved_patches:
+            ax.add_collection(PatchCollection(curved_patches, match_original=True))
         
         # Draw node labels (node numbers)
         # Adjust font size based on scale and number of nodes
@@ -169,7 +215,8 @@ def make_multigraph_image(widget,extracted_data_path,base_name,scale_factor=1.0)
             font_weight='bold',
             font_color='black',
             # Add a white background to make labels more readable
-            bbox=dict(facecolor='white', edgecolor='none', alpha=0.7, pad=1)
+            bbox=dict(facecolor='white', edgecolor='none', alpha=0.7, pad=1),
+            ax=ax
         )
         
         # Create legend
@@ -179,7 +226,7 @@ def make_multigraph_image(widget,extracted_data_path,base_name,scale_factor=1.0)
             Line2D([0], [0], marker='o', color='w', markerfacecolor='lightblue', markersize=10, label='Other Nodes')
         ]
         
-        plt.legend(
+        ax.legend(
             handles=legend_elements, 
             loc='upper right',
             frameon=True,
@@ -196,8 +243,8 @@ def make_multigraph_image(widget,extracted_data_path,base_name,scale_factor=1.0)
         multiple_edges = sum(1 for count in edge_count.values() if count > 1)
         
         # Add title and subtitle
-        plt.title(f"Multigraph from {base_name}", fontsize=14)
-        plt.figtext(
+        ax.set_title(f"Multigraph from {base_name}", fontsize=14)
+        fig.text(
             0.5, 0.01,
             f"Total nodes: {total_nodes} - Total edges: {total_edges} - Unique edges: {unique_edges} - "
             f"Multiple edges: {multiple_edges} - Scale: {scale_factor}x",
@@ -206,15 +253,19 @@ def make_multigraph_image(widget,extracted_data_path,base_name,scale_factor=1.0)
         )
         
         # Remove axis and set tight layout
-        plt.axis('off')
-        plt.tight_layout(pad=2.0)
-        plt.subplots_adjust(left=0.05, right=0.95, top=0.95, bottom=0.05)
-        
-        # Save the figure
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        ax.set_axis_off()
+        fig.tight_layout(pad=2.0)
+        fig.subplots_adjust(left=0.05, right=0.95, top=0.95, bottom=0.05)
+
+        # Save the figure (fast PNG encode; SVG is vector so no dpi)
+        if output_format == 'svg':
+            fig.savefig(output_path, bbox_inches='tight')
+        else:
+            fig.savefig(output_path, dpi=dpi, bbox_inches='tight',
+                        pil_kwargs={'optimize': True, 'compress_level': 1})
         
         app_state.graph_image_path = output_path
+        app_state.graph_cache[extracted_data_path] = (csv_mtime, output_path)
         widget.log_status(f"Graph saved to: {output_path}")
         return True
         
@@ -222,23 +273,121 @@ def make_multigraph_image(widget,extracted_data_path,base_name,scale_factor=1.0)
         widget.log_status(f"Error processing file: {str(e)}")
         return False
 
+class _GraphRenderSignals(QObject):
+    """Signals bridging the render worker back to the main thread."""
+    status = Signal(str)
+    finished = Signal(bool)
+
+
+class _GraphRenderRelay:
+    """Widget stand-in handed to make_multigraph_image on the worker
+    thread; log_status calls are re-emitted as queued signals so the
+    real QTextEdit is only touched from the main thread."""
+
+    def __init__(self, signals):
+        self._signals = signals
+
+    def log_status(self, message):
+        self._signals.status.emit(message)
+
+
+class _GraphRenderTask(QRunnable):
+    def __init__(self, extracted_data_path, base_name, signals):
+        super().__init__()
+        self.extracted_data_path = extracted_data_path
+        self.base_name = base_name
+        self.signals = signals
+        # Keep the Python wrapper alive until the queued signals land
+        self.setAutoDelete(False)
+
+    def run(self):
+        relay = _GraphRenderRelay(self.signals)
+        success = make_multigraph_image(relay, self.extracted_data_path, self.base_name)
+        self.signals.finished.emit(success)
+
+
+def make_multigraph_image_async(widget, extracted_data_path, base_name, on_done):
+    """Render the multigraph on a worker thread so the Qt UI stays live.
+
+    The pandas read, networkx layout and matplotlib save run on
+    QThreadPool's global pool; ``on_done(success)`` and all status
+    messages are delivered back on the main thread via queued signals.
+    """
+    # Every in-flight task (with its signal bridge) stays strongly
+    # referenced until its finished signal lands; a single slot let a
+    # second render drop the first task while it was still running
+    tasks = getattr(widget, '_graph_render_tasks', None)
+    if tasks is None:
+        tasks = widget._graph_render_tasks = set()
+
+    for running in tasks:
+        if (running.extracted_data_path == extracted_data_path
+                and running.base_name == base_name):
+            # Identical render already in flight: piggyback on it rather
+            # than racing a second writer on the same output file
+            running.signals.finished.connect(on_done)
+            return
+
+    signals = _GraphRenderSignals()
+    signals.status.connect(widget.log_status)
+    task = _GraphRenderTask(extracted_data_path, base_name, signals)
+
+    def _done(success):
+        tasks.discard(task)
+        on_done(success)
+
+    signals.finished.connect(_done)
+    tasks.add(task)
+    QThreadPool.globalInstance().start(task)
+
+
+# Last smooth-scaled pixmap, keyed by ((path, mtime), width)
+_last_scaled = {'key': None, 'pixmap': None}
+
+
 def load_graph_on_viewer(widget):
-    
-    # Load the image and convert to QPixmap for display
-    graph_image = QImage(app_state.graph_image_path)
-    pixmap = QPixmap.fromImage(graph_image)
-    
+
+    # Load the image and convert to QPixmap for display; the pixmap is
+    # cached keyed by (path, mtime) so redraws skip the disk read, and
+    # the scaled copy is reused while the scroll width is unchanged
+    path = app_state.graph_image_path
+    key = (path, os.path.getmtime(path) if os.path.exists(path) else None)
+
     # Calculate available width from the scroll area
     available_width = widget.graph_scroll.width() - 20  # Subtract some padding
-    
-    # Scale the image to fit while maintaining aspect ratio
-    scaled_pixmap = pixmap.scaled(
-        available_width, 
-        available_width,  # Use width for height too to maintain aspect ratio
-        Qt.KeepAspectRatio, 
-        Qt.SmoothTransformation
-    )
-    
+
+    scaled_key = (key, available_width)
+    if _last_scaled['key'] == scaled_key:
+        scaled_pixmap = _last_scaled['pixmap']
+    else:
+        pixmap = app_state.graph_pixmap_cache.get(key)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(QImage(path))
+            app_state.graph_pixmap_cache[key] = pixmap
+
+        # Scale with nearest-neighbour first so display (and live
+        # resizing) is instant; the smooth resample runs once things
+        # settle and replaces the pixmap in place
+        scaled_pixmap = pixmap.scaled(
+            available_width,
+            available_width,  # Use width for height too to maintain aspect ratio
+            Qt.KeepAspectRatio,
+            Qt.FastTransformation
+        )
+
+        def _smooth_rescale():
+            smooth = pixmap.scaled(
+                available_width,
+                available_width,
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation
+            )
+            _last_scaled['key'] = scaled_key
+            _last_scaled['pixmap'] = smooth
+            widget.graph_image_label.setPixmap(smooth)
+
+        QTimer.singleShot(150, _smooth_rescale)
+
     # Display the image in the graph_image_label
     widget.graph_image_label.setPixmap(scaled_pixmap)
     widget.graph_image_label.setMinimumSize(scaled_pixmap.width(), scaled_pixmap.height())
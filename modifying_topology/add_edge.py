@@ -1,7 +1,10 @@
+import logging
+
 import pandas as pd
 import numpy as np
 from app_state import app_state
-from utils.parsing import get_float_pos_comma
+
+logger = logging.getLogger(__name__)
 
 
 def join(viewer,node_ind_0=None,node_ind_1=None,from_remove=False):
@@ -17,126 +20,77 @@ def join(viewer,node_ind_0=None,node_ind_1=None,from_remove=False):
     if not from_remove:
         extracted_layer = viewer.layers['Extracted Nodes']
 
-    #Find connected nodes if any
-    node_positions = nd_pdf['Position(ZXY)'].tolist()
-    node_positions_fl = [get_float_pos_comma(st) for st in node_positions]
-    nodes_extracted = nd_pdf['Node ID'].tolist()
-    node_ids = [int(st) for st in nodes_extracted]
-    max_node_id = max(node_ids)
-    check_ind_0 = False
-    check_ind_1 = False
+    #Find connected nodes if any (SoA arrays are parsed once per CSV
+    #load instead of re-parsing every position string per click)
+    if (app_state.node_positions_arr is None
+            or len(app_state.node_ids_arr) != len(nd_pdf)):
+        app_state.rebuild_node_arrays()
+    node_positions_fl = app_state.node_positions_arr
+    node_ids = app_state.node_ids_arr
+    max_node_id = int(node_ids.max())
 
     #indices of selected nodes and their positions
-    if not from_remove and (len(list(extracted_layer.selected_data))!=2):
-        print('here1')
+    if not from_remove and (len(extracted_layer.selected_data)!=2):
+        logger.debug('join called without exactly two selected nodes')
         return
 
+    # Resolve both endpoints to (iloc, node id), marking the ones that
+    # do not exist yet; the four old both/one/neither branches collapse
+    # into one pass over these two endpoints
     if not from_remove:
-        ind_0 = list(extracted_layer.selected_data)[0]
-        ind_1 = list(extracted_layer.selected_data)[1]
+        sel_it = iter(extracted_layer.selected_data)
+        ind_0 = next(sel_it)
+        ind_1 = next(sel_it)
         pos_0 =(extracted_layer.data[ind_0])
         pos_1 =(extracted_layer.data[ind_1])
-   
-        
-        for posts in node_positions_fl:
-            check_ind_0 = np.all(pos_0 == posts) or check_ind_0
-            check_ind_1 = np.all(pos_1 == posts) or check_ind_1
-
-
-    if (check_ind_0 and check_ind_1) or from_remove:
-        if not from_remove:    
-            for pn,posts in enumerate(node_positions_fl):
-                if(np.all(pos_0 == posts)): node_ind_0 = pn; node_id_0 = node_ids[pn]
-                if(np.all(pos_1 == posts)): node_ind_1 = pn; node_id_1 = node_ids[pn]
-        elif from_remove:
-            node_id_0 = node_ids[node_ind_0]
-            node_id_1 = node_ids[node_ind_1]
-
-        print('Joining nodes: ',node_id_0,node_id_1)
-        connected_nodes_0 = get_float_pos_comma(nd_pdf.loc[node_ind_0,'Neighbour ID'])
-        connected_nodes_1 = get_float_pos_comma(nd_pdf.loc[node_ind_1,'Neighbour ID'])
-        print(connected_nodes_0,connected_nodes_1)
-        connected_nodes_0.append(node_id_1)
-        connected_nodes_1.append(node_id_0)
-        print(connected_nodes_0,connected_nodes_1)
-        nd_pdf.loc[node_ind_0,'Neighbour ID'] = str(connected_nodes_0)
-        nd_pdf.loc[node_ind_0,'Degree of Node'] = len(connected_nodes_0)
-
-        nd_pdf.loc[node_ind_1,'Neighbour ID'] = str(connected_nodes_1)
-        nd_pdf.loc[node_ind_1,'Degree of Node'] = len(connected_nodes_1)
 
-        print(nd_pdf)
-        nd_pdf.to_csv(node_path,index=False)
-        return
-
-    
-    elif (not check_ind_0) and check_ind_1:
-        for pn,posts in enumerate(node_positions_fl):
-            if(np.all(pos_1 == posts)): node_id_1 =pn
-
-        connected_nodes_1 = get_float_pos_comma(nd_pdf.loc[node_id_1,'Neighbour ID'])
-
-        insert_loc = nd_pdf.index.max()
-        if pd.isna(insert_loc):
-            insert_loc = 0    
+        # One vectorized comparison per selected point instead of a
+        # Python loop over every node position
+        eq_0 = (node_positions_fl == np.asarray(pos_0)[None, :]).all(axis=1)
+        eq_1 = (node_positions_fl == np.asarray(pos_1)[None, :]).all(axis=1)
+        check_ind_0 = bool(eq_0.any())
+        check_ind_1 = bool(eq_1.any())
+        node_ind_0 = int(eq_0.argmax()) if check_ind_0 else None
+        node_ind_1 = int(eq_1.argmax()) if check_ind_1 else None
+    else:
+        check_ind_0 = check_ind_1 = True
+        pos_0 = pos_1 = None
+
+    next_id = max_node_id
+    new_rows = []
+    endpoints = []
+    for exists, iloc, pos in ((check_ind_0, node_ind_0, pos_0),
+                              (check_ind_1, node_ind_1, pos_1)):
+        if exists:
+            endpoints.append((iloc, int(node_ids[iloc])))
         else:
-            insert_loc = insert_loc+1
-        
-        nd_pdf.loc[insert_loc,'Node ID'] = max_node_id+1
-        nd_pdf.loc[insert_loc,'Degree of Node'] = 1
-        nd_pdf.loc[insert_loc,'Position(ZXY)'] = str(pos_0)
-        nd_pdf.loc[insert_loc,'Neighbour ID'] = [node_id_1]
-
-        connected_nodes_1.append(max_node_id+1)
-        nd_pdf.loc[node_id_1,'Neighbour ID'] = str(connected_nodes_1)
-        nd_pdf.loc[node_id_1,'Degree of Node'] = len(connected_nodes_1)
-
-        nd_pdf.to_csv(node_path,index=False)
-        return
-    
-
-
-    elif (not check_ind_1) and check_ind_0:
-
-        for pn,posts in enumerate(node_positions_fl):
-            if(np.all(pos_0 == posts)): node_id_0 =pn
-        connected_nodes_0 = get_float_pos_comma(nd_pdf.loc[node_id_0,'Neighbour ID'])
-
-        insert_loc = nd_pdf.index.max()
-        if pd.isna(insert_loc):
-            insert_loc = 0    
+            next_id += 1
+            new_rows.append({'Node ID': next_id,
+                             'Degree of Node': 0,
+                             'Position(ZXY)': str(pos),
+                             'Neighbour ID': []})
+            endpoints.append((len(nd_pdf) + len(new_rows) - 1, next_id))
+
+    if new_rows:
+        nd_pdf = pd.concat([nd_pdf, pd.DataFrame(new_rows)], ignore_index=True)
+        app_state.node_dataframe = nd_pdf
+
+    (iloc_0, node_id_0), (iloc_1, node_id_1) = endpoints
+    logger.debug('Joining nodes: %s %s', node_id_0, node_id_1)
+    for iloc, other_id in ((iloc_0, node_id_1), (iloc_1, node_id_0)):
+        # Freshly appended rows are not in the CSR arrays yet but have
+        # no neighbours by construction
+        if iloc < len(node_ids):
+            connected_nodes = app_state.node_neighbours(iloc).tolist()
         else:
-            insert_loc = insert_loc+1
-        
-        nd_pdf.loc[insert_loc,'Node ID'] = max_node_id+1
-        nd_pdf.loc[insert_loc,'Degree of Node'] = 1
-        nd_pdf.loc[insert_loc,'Position(ZXY)'] = str(pos_1)
-        nd_pdf.loc[insert_loc,'Neighbour ID'] = [node_id_0]
-
-        connected_nodes_0.append(max_node_id+1)
-        nd_pdf.loc[node_id_0,'Neighbour ID'] = str(connected_nodes_0)
-        nd_pdf.loc[node_id_0,'Degree of Node'] = len(connected_nodes_0)
-
-        nd_pdf.to_csv(node_path,index=False)
-        return
-    
-    elif (not check_ind_0) and (not check_ind_1):
-        
-        insert_loc = nd_pdf.index.max()
-        if pd.isna(insert_loc):
-            insert_loc = 0    
-        else:
-            insert_loc = insert_loc+1
-        
-        nd_pdf.loc[insert_loc,'Node ID'] = max_node_id+1
-        nd_pdf.loc[insert_loc,'Degree of Node'] = 1
-        nd_pdf.loc[insert_loc,'Position(ZXY)'] = str(pos_0)
-        nd_pdf.loc[insert_loc,'Neighbour ID'] = [max_node_id+2]
-
-        nd_pdf.loc[insert_loc+1,'Node ID'] = max_node_id+2
-        nd_pdf.loc[insert_loc+1,'Degree of Node'] = 1
-        nd_pdf.loc[insert_loc+1,'Position(ZXY)'] = str(pos_1)
-        nd_pdf.loc[insert_loc+1,'Neighbour ID'] = [max_node_id+1]
-
-        nd_pdf.to_csv(node_path,index=False)
-        return
\ No newline at end of file
+            connected_nodes = []
+        connected_nodes.append(other_id)
+        nd_pdf.at[iloc,'Neighbour ID'] = connected_nodes
+        nd_pdf.at[iloc,'Degree of Node'] = len(connected_nodes)
+
+    # Guard the full-DataFrame dump so its repr is never built unless
+    # debug logging is actually on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('%s', nd_pdf)
+    app_state.dirty = True; app_state.save_if_dirty()
+    app_state.rebuild_node_arrays()
\ No newline at end of file
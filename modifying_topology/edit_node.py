@@ -1,7 +1,6 @@
 import pandas as pd
 import numpy as np
 from app_state import app_state
-from utils.parsing import get_float_pos_comma
 
 
 def highlight(viewer,widget):
@@ -17,23 +16,31 @@ def highlight(viewer,widget):
     extracted_layer = viewer.layers['Extracted Nodes']
 
     #indices of selected nodes and their positions
-    if (len(list(extracted_layer.selected_data))==0):
+    if (len(extracted_layer.selected_data)==0):
         widget.log_status("No node selected to edit.")
         return
-    ind = list(extracted_layer.selected_data)[0]
+    ind = next(iter(extracted_layer.selected_data))
     pos =(extracted_layer.data[ind])
     app_state.selected_node_position = pos    
     
-    #Find connected nodes if any
-    node_ids = nd_pdf['Node ID'].tolist()
-    node_positions = nd_pdf['Position(ZXY)'].tolist()
+    #Find connected nodes if any (SoA arrays are parsed once per CSV
+    #load instead of re-parsing every position string per click)
+    if (app_state.node_positions_arr is None
+            or len(app_state.node_ids_arr) != len(nd_pdf)):
+        app_state.rebuild_node_arrays()
+    node_ids = app_state.node_ids_arr
+    positions_arr = app_state.node_positions_arr
 
-    ind_selected = [stn for stn,st in enumerate(list(node_positions)) if (get_float_pos_comma(st) == pos).all()][0]
-    connected_nodes = get_float_pos_comma(nd_pdf.loc[ind_selected,'Neighbour ID'])
-    
-    for eln,el in enumerate(node_ids):
-        if el in connected_nodes:
-            app_state.editable_node_positions.append(get_float_pos_comma(node_positions[eln]))
+    # Selected points are existing node positions, so an O(1) hash
+    # lookup resolves the row without any scan or tree query
+    ind_selected = app_state.pos_to_iloc.get(tuple(np.round(pos, 6)))
+    if ind_selected is None:
+        widget.log_status("Selected point does not match a known node.")
+        return
+    connected_nodes = app_state.node_neighbours(ind_selected)
+
+    connected_mask = np.isin(node_ids, connected_nodes)
+    app_state.editable_node_positions.extend(positions_arr[connected_mask].tolist())
     widget.log_status(f"Connected nodes found: {len(app_state.editable_node_positions)}")
     app_state.points_layer = viewer.add_points(
                                     app_state.editable_node_positions,
@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 from app_state import app_state
-from utils.layer_loader import load_image_and_skeleton
+from utils.layer_loader import _COLOR_RGBA
 
 
 # Preview state tracking
@@ -9,7 +9,11 @@ preview_state = {
     'enabled': False,
     'layer': None,
     'last_position': None,
-    'mouse_callback': None
+    'mouse_callback': None,
+    # Coalesced mouse-move handling: moves only record pending_pos and
+    # a ~60 Hz single-shot timer applies the latest one to the layer
+    'pending_pos': None,
+    'timer': None
 }
 
 # Z-plane lock state tracking
@@ -20,18 +24,28 @@ z_lock_state = {
 
 
 def find_nearest_skeleton_point(cursor_pos, skeleton_layer):
-    """Return the cursor position, with optional Z-plane locking.
+    """Snap the cursor position to the nearest skeleton voxel.
+
+    Uses the cKDTree over the loaded skeleton coordinates for an
+    O(log N) nearest-neighbour query; falls back to the rounded cursor
+    position when no skeleton is loaded.
 
     Args:
         cursor_pos: Cursor position [z, y, x]
         skeleton_layer: Napari shapes layer containing skeleton (unused)
 
     Returns:
-        numpy.ndarray: Cursor position [z, y, x] with locked Z if enabled (as integers)
+        numpy.ndarray: Nearest skeleton position [z, y, x] with locked Z
+        if enabled (as integers)
     """
     # Round cursor position to integers
     position = np.round(cursor_pos).astype(int)
 
+    tree = app_state.skeleton_kdtree
+    if tree is not None:
+        _, idx = tree.query(position, k=1)
+        position = np.asarray(app_state.skeleton_coords[idx]).astype(int)
+
     # If Z is locked, replace Z coordinate with locked value
     if z_lock_state['locked'] and z_lock_state['z_value'] is not None:
         position[0] = int(np.round(z_lock_state['z_value']))
@@ -39,9 +53,25 @@ def find_nearest_skeleton_point(cursor_pos, skeleton_layer):
     return position
 
 
+def _apply_pending_preview(viewer):
+    """Move the preview layer to the last recorded cursor position."""
+    snapped_pos = preview_state['pending_pos']
+    preview_state['pending_pos'] = None
+
+    if snapped_pos is None or not preview_state['enabled']:
+        return
+    if preview_state['layer'] is not None and preview_state['layer'] in viewer.layers:
+        preview_state['layer'].data = snapped_pos[None, :]
+        preview_state['last_position'] = snapped_pos
+
+
 def update_preview_position(viewer, event):
     """Update the preview point position based on cursor location.
 
+    Mouse moves arrive far faster than napari can repaint, so this only
+    records the snapped position; a single-shot ~60 Hz timer applies the
+    latest one, coalescing the events in between.
+
     Args:
         viewer: Napari viewer instance
         event: Mouse move event
@@ -58,13 +88,25 @@ def update_preview_position(viewer, event):
     # Take only the 3D coordinates (z, y, x)
     cursor_pos = np.array(cursor_pos[-3:])
 
-    # Snap to nearest skeleton point
-    snapped_pos = find_nearest_skeleton_point(cursor_pos, None)
+    # Snap to nearest skeleton point and park it for the timer
+    already_scheduled = preview_state['pending_pos'] is not None
+    preview_state['pending_pos'] = find_nearest_skeleton_point(cursor_pos, None)
 
-    # Update preview layer if it exists
-    if preview_state['layer'] is not None and preview_state['layer'] in viewer.layers:
-        preview_state['layer'].data = np.array([snapped_pos])
-        preview_state['last_position'] = snapped_pos
+    if already_scheduled:
+        return
+    if preview_state['timer'] is None:
+        from qtpy.QtCore import QTimer
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.setInterval(16)
+        preview_state['timer'] = timer
+    timer = preview_state['timer']
+    try:
+        timer.timeout.disconnect()
+    except (TypeError, RuntimeError):
+        pass
+    timer.timeout.connect(lambda: _apply_pending_preview(viewer))
+    timer.start()
 
 
 def toggle_preview_mode(viewer, widget):
@@ -207,59 +249,74 @@ def insert_node_at_cursor(viewer, widget):
         node_ids = nd_pdf['Node ID'].dropna().astype(int)
         max_node_id = node_ids.max() if len(node_ids) > 0 else 0
 
-    # Get next index location
-    insert_loc = nd_pdf.index.max()
-    if pd.isna(insert_loc):
-        insert_loc = 0
-    else:
-        insert_loc = insert_loc + 1
-
-    # Create new node entry
+    # Create new node entry, appended as one row instead of four
+    # separate .loc writes through the pandas indexing machinery
     new_node_id = max_node_id + 1
-    nd_pdf.loc[insert_loc, 'Node ID'] = new_node_id
-    nd_pdf.loc[insert_loc, 'Degree of Node'] = 0  # Isolated node
-    # Convert to list of Python ints for consistent formatting
-    nd_pdf.loc[insert_loc, 'Position(ZXY)'] = str([int(x) for x in snapped_pos])
-    nd_pdf.loc[insert_loc, 'Neighbour ID'] = '[]'  # No neighbors initially
+    new_row = {'Node ID': new_node_id,
+               'Degree of Node': 0,  # Isolated node
+               # Convert to list of Python ints for consistent formatting
+               'Position(ZXY)': str([int(x) for x in snapped_pos]),
+               'Neighbour ID': []}  # No neighbors initially
+    nd_pdf = pd.concat([nd_pdf, pd.DataFrame([new_row])], ignore_index=True)
 
     # Update app state
     app_state.node_dataframe = nd_pdf
 
     # Save to CSV
-    nd_pdf.to_csv(node_path, index=False)
-
-    # Reload visualization to show updated network properly
-    viewer.layers.clear()
-
-    raw_im, skel_im, face_colors, positions, colors, edge_lines = load_image_and_skeleton(
-        app_state.nellie_output_path
-    )
-
-    if raw_im is not None and skel_im is not None:
-        # Add raw image layer
-        app_state.raw_layer = viewer.add_image(
-            raw_im,
-            scale=app_state.visualization_scale,
-            name='Raw Image'
-        )
-
-        # Add skeleton as points layer
-        app_state.skeleton_layer = viewer.add_points(
-            skel_im,
-            size=3,
-            face_color=face_colors,
-            scale=app_state.visualization_scale,
-            name='Skeleton'
-        )
-
-        # Add extracted nodes if available
-        if positions and colors:
-            app_state.points_layer = viewer.add_points(
-                positions,
-                size=5,
-                face_color=colors,
-                scale=app_state.visualization_scale,
-                name='Extracted Nodes'
-            )
+    app_state.dirty = True
+    app_state.save_if_dirty()
+    app_state.rebuild_node_arrays()
+
+    # Append the new point in place instead of reloading every layer.
+    # Points live in an amortized capacity-doubling buffer so N inserts
+    # move O(N) bytes total rather than O(N^2) via repeated full copies.
+    # Seed from the full-resolution cache, not the layer: while zoomed
+    # out the layer may only hold a decimated subsample of the nodes
+    current_data = app_state.full_node_positions
+    current_colors = app_state.full_node_colors
+    if current_data is None:
+        current_data = np.asarray(extracted_layer.data)
+        current_colors = np.asarray(extracted_layer.face_color)
+    if (app_state._points_buf is None
+            or app_state._points_len != len(current_data)):
+        # (Re)seed the buffer whenever another code path replaced the
+        # node cloud behind our back
+        cap = max(16, 2 * len(current_data))
+        app_state._points_buf = np.empty((cap, 3), dtype=np.float32)
+        app_state._points_buf[:len(current_data)] = current_data
+        # Colours grow in lockstep so appends never round-trip the
+        # layer's colour array through a Python list
+        app_state._face_color_buf = np.empty((cap, 4), dtype=np.uint8)
+        if len(current_data) > 0:
+            seed_colors = np.asarray(current_colors)
+            if seed_colors.dtype != np.uint8:
+                seed_colors = (seed_colors * 255).astype(np.uint8)
+            app_state._face_color_buf[:len(current_data)] = seed_colors
+        app_state._points_len = len(current_data)
+    elif app_state._points_len == len(app_state._points_buf):
+        cap = 2 * len(app_state._points_buf)
+        app_state._points_buf = np.resize(app_state._points_buf, (cap, 3))
+        app_state._face_color_buf = np.resize(app_state._face_color_buf, (cap, 4))
+    app_state._points_buf[app_state._points_len] = snapped_pos
+    # An isolated node is drawn white like the loader does
+    app_state._face_color_buf[app_state._points_len] = _COLOR_RGBA['white']
+    app_state._points_len += 1
+
+    extracted_layer.data = app_state._points_buf[:app_state._points_len]
+    extracted_layer.face_color = app_state._face_color_buf[:app_state._points_len]
+
+    # Keep the decimation cache in step with the layer, otherwise the
+    # next zoom-triggered swap would restore the pre-insert point cloud
+    app_state.full_node_positions = app_state._points_buf[:app_state._points_len]
+    app_state.full_node_colors = app_state._face_color_buf[:app_state._points_len]
+
+    # Recolour the skeleton voxel under the new node without a reload
+    soa = app_state.skeleton_soa
+    if soa is not None and len(soa.pos) > 0:
+        skel_mask = (soa.pos == np.asarray(snapped_pos, dtype=np.float32)).all(axis=1)
+        if skel_mask.any() and 'Skeleton' in viewer.layers:
+            soa.rgba[skel_mask] = _COLOR_RGBA['white']
+            soa.kind[skel_mask] = 0
+            viewer.layers['Skeleton'].face_color = soa.rgba
 
     widget.log_status(f"Inserted new node (ID: {new_node_id}) at position {snapped_pos}")
@@ -1,7 +1,6 @@
 import pandas as pd
 import numpy as np
 from app_state import app_state
-from utils.parsing import get_float_pos_comma
 from .add_edge import join
 
 def remove(viewer)->bool:
@@ -18,36 +17,40 @@ def remove(viewer)->bool:
         return flag
     extracted_layer = viewer.layers['Extracted Nodes']
 
-    #Find connected nodes if any
-    node_ids = nd_pdf['Node ID'].tolist()
-    node_positions = nd_pdf['Position(ZXY)'].tolist()
-    node_positions_fl = [get_float_pos_comma(st) for st in node_positions]
+    #Find connected nodes via the SoA arrays (parsed once per CSV load
+    #instead of re-parsing every position string per click)
+    if (app_state.node_positions_arr is None
+            or len(app_state.node_ids_arr) != len(nd_pdf)):
+        app_state.rebuild_node_arrays()
+    node_ids = app_state.node_ids_arr
+    node_positions_fl = app_state.node_positions_arr
 
     #indices of selected nodes and their positions
-    if (len(list(extracted_layer.selected_data))!=2):
+    if (len(extracted_layer.selected_data)!=2):
         flag = True
         return flag
-    ind_0 = list(extracted_layer.selected_data)[0]
-    ind_1 = list(extracted_layer.selected_data)[1]
-    pos_0 =list((extracted_layer.data[ind_0]))
-    pos_1 =list((extracted_layer.data[ind_1]))
-    
-    check_ind_0 = False
-    check_ind_1 = False
-    for pn,posts in enumerate(node_positions_fl):
-        if np.all(pos_0 == posts):
-            node_index_0 = pn
-            node_id_0 = node_ids[pn]
-            check_ind_0 = True
-        if np.all(pos_1 == posts):
-            node_index_1 = pn
-            node_id_1 = node_ids[pn]
-            check_ind_1 = True 
+    sel_it = iter(extracted_layer.selected_data)
+    ind_0 = next(sel_it)
+    ind_1 = next(sel_it)
+    pos_0 = extracted_layer.data[ind_0]
+    pos_1 = extracted_layer.data[ind_1]
+
+    # One vectorized comparison per endpoint instead of a Python loop
+    idx_0 = np.flatnonzero((node_positions_fl == np.asarray(pos_0)[None, :]).all(axis=1))
+    idx_1 = np.flatnonzero((node_positions_fl == np.asarray(pos_1)[None, :]).all(axis=1))
+    check_ind_0 = idx_0.size > 0
+    check_ind_1 = idx_1.size > 0
+    if check_ind_0:
+        node_index_0 = int(idx_0[0])
+        node_id_0 = int(node_ids[node_index_0])
+    if check_ind_1:
+        node_index_1 = int(idx_1[0])
+        node_id_1 = int(node_ids[node_index_1])
 
     if check_ind_0 and check_ind_1:
         
-        connected_nodes_0 = get_float_pos_comma(nd_pdf.loc[node_index_0,'Neighbour ID'])
-        connected_nodes_1 = get_float_pos_comma(nd_pdf.loc[node_index_1,'Neighbour ID'])
+        connected_nodes_0 = app_state._parse_neighbour_cell(nd_pdf.at[node_index_0,'Neighbour ID'])
+        connected_nodes_1 = app_state._parse_neighbour_cell(nd_pdf.at[node_index_1,'Neighbour ID'])
 
         print(connected_nodes_0)
         print(connected_nodes_1)
@@ -61,73 +64,70 @@ def remove(viewer)->bool:
         connected_nodes_0.remove(node_id_1)
         connected_nodes_1.remove(node_id_0)
 
-        nd_pdf.loc[node_index_0,'Neighbour ID'] = str(connected_nodes_0)
-        nd_pdf.loc[node_index_0,'Degree of Node'] = len(connected_nodes_0)
-        nd_pdf.loc[node_index_1,'Neighbour ID'] = str(connected_nodes_1)
-        nd_pdf.loc[node_index_1,'Degree of Node'] = len(connected_nodes_1)        
+        nd_pdf.at[node_index_0,'Neighbour ID'] = connected_nodes_0
+        nd_pdf.at[node_index_0,'Degree of Node'] = len(connected_nodes_0)
+        nd_pdf.at[node_index_1,'Neighbour ID'] = connected_nodes_1
+        nd_pdf.at[node_index_1,'Degree of Node'] = len(connected_nodes_1)        
 
         if ((len(connected_nodes_0) == 2) and (node_id_0 not in connected_nodes_0)):
             
             neigh_id_0, neigh_id_1 = connected_nodes_0
-            print(node_ids)
-
-            for idn,id in enumerate(node_ids):
-                if neigh_id_0 == id: 
-                    neigh_ind_0 = idn
-                    nns_0 = get_float_pos_comma(nd_pdf.loc[idn,'Neighbour ID'])
-                    nns_0.remove(node_id_0)
-                    nd_pdf.loc[idn,'Neighbour ID'] = str(nns_0)
-                    nd_pdf.loc[idn,'Degree of Node'] = len(nns_0)
-                if neigh_id_1 == id: 
-                    neigh_ind_1 = idn
-                    nns_1 = get_float_pos_comma(nd_pdf.loc[idn,'Neighbour ID'])
-                    nns_1.remove(node_id_0)
-                    nd_pdf.loc[idn,'Neighbour ID'] = str(nns_1)
-                    nd_pdf.loc[idn,'Degree of Node'] = len(nns_1)
+
+            # Dict lookup instead of a linear scan over every node id
+            id_to_iloc = {int(v): i for i, v in enumerate(node_ids)}
+            neigh_ind_0 = id_to_iloc[int(neigh_id_0)]
+            neigh_ind_1 = id_to_iloc[int(neigh_id_1)]
+            for idn in (neigh_ind_0, neigh_ind_1):
+                nns = app_state._parse_neighbour_cell(nd_pdf.at[idn,'Neighbour ID'])
+                nns.remove(node_id_0)
+                nd_pdf.at[idn,'Neighbour ID'] = nns
+                nd_pdf.at[idn,'Degree of Node'] = len(nns)
 
             print(neigh_id_0,neigh_id_1)
             print(neigh_ind_0,neigh_ind_1)
+            # join(from_remove=True) reads the SoA neighbour arrays, so
+            # refresh them after the in-place edits above
+            app_state.rebuild_node_arrays()
             join(viewer,neigh_ind_0,neigh_ind_1,True)
+            # Close the hole left by the drop right away: join() below
+            # writes with label-based .at against positional ilocs, so
+            # positional and label indexing must stay in agreement
             nd_pdf.drop(node_index_0,inplace=True)
-        
-        
-        nd_pdf.to_csv(node_path,index=False)
-        node_ids = nd_pdf['Node ID'].tolist()
-        node_positions = nd_pdf['Position(ZXY)'].tolist()
+            nd_pdf.reset_index(drop=True, inplace=True)
+
 
         if ((len(connected_nodes_1) == 2) and (node_id_1 not in connected_nodes_0)):
-            
+
             neigh_id_0, neigh_id_1 = connected_nodes_1
-            print(node_ids)
-            for idn,id in enumerate(node_ids):
-                if neigh_id_0 == id: 
-                    neigh_ind_0 = idn
-                    nns_0 = get_float_pos_comma(nd_pdf.loc[idn,'Neighbour ID'])
-                    nns_0.remove(node_id_1)
-                    nd_pdf.loc[idn,'Neighbour ID'] = str(nns_0)
-                    nd_pdf.loc[idn,'Degree of Node'] = len(nns_0)
-                    print(nd_pdf)
-                    nd_pdf.to_csv(node_path,index=False)
-                if neigh_id_1 == id: 
-                    neigh_ind_1 = idn
-                    nns_1 = get_float_pos_comma(nd_pdf.loc[idn,'Neighbour ID'])
-                    nns_1.remove(node_id_1)
-                    nd_pdf.loc[idn,'Neighbour ID'] = str(nns_1)
-                    nd_pdf.loc[idn,'Degree of Node'] = len(nns_1)
-                    print(nd_pdf)
-                    nd_pdf.to_csv(node_path,index=False)
 
+            # Rebuild the dict from the table itself, since the first
+            # branch may have dropped a row and reindexed above
+            id_to_df_index = {int(v): idx for v, idx in
+                              zip(nd_pdf['Node ID'], nd_pdf.index)}
+            for nd_idx in (id_to_df_index[int(neigh_id_0)],
+                           id_to_df_index[int(neigh_id_1)]):
+                nns = app_state._parse_neighbour_cell(nd_pdf.at[nd_idx,'Neighbour ID'])
+                nns.remove(node_id_1)
+                nd_pdf.at[nd_idx,'Neighbour ID'] = nns
+                nd_pdf.at[nd_idx,'Degree of Node'] = len(nns)
+
+            app_state.rebuild_node_arrays()
+            neigh_ind_0 = int(np.flatnonzero(app_state.node_ids_arr == int(neigh_id_0))[0])
+            neigh_ind_1 = int(np.flatnonzero(app_state.node_ids_arr == int(neigh_id_1))[0])
             print(neigh_id_0,neigh_id_1)
             print(neigh_ind_0,neigh_ind_1)
             join(viewer,neigh_ind_0,neigh_ind_1,True)
-            print(nd_pdf)
-            nd_pdf.drop(node_index_1,inplace=True)
-            print(nd_pdf)
-            nd_pdf.to_csv(node_path,index=False)
+            # node_index_1 was resolved before the first branch may have
+            # reindexed the frame, so drop by the live id -> index map
+            # and reindex again to keep positional and label access aligned
+            nd_pdf.drop(id_to_df_index[int(node_id_1)],inplace=True)
+            nd_pdf.reset_index(drop=True, inplace=True)
 
         print(connected_nodes_0)
         print(connected_nodes_1)
-        nd_pdf.to_csv(node_path,index=False)
+        # All edits above flush through one deferred save
+        app_state.dirty = True; app_state.save_if_dirty()
+        app_state.rebuild_node_arrays()
         return flag
 
     else:
@@ -2,7 +2,6 @@ import pandas as pd
 import numpy as np
 from app_state import app_state
 from utils.layer_loader import load_image_and_skeleton
-from utils.parsing import get_float_pos_comma
 
 
 def remove_node(viewer, widget):
@@ -27,75 +26,107 @@ def remove_node(viewer, widget):
     extracted_layer = viewer.layers['Extracted Nodes']
 
     # Get selected node
-    selected_indices = list(extracted_layer.selected_data)
-    if len(selected_indices) == 0:
+    if len(extracted_layer.selected_data) == 0:
         widget.log_status("No node selected. Please select a node to remove.")
         return
-    elif len(selected_indices) > 1:
+    elif len(extracted_layer.selected_data) > 1:
         widget.log_status("Multiple nodes selected. Please select only one node to remove.")
         return
 
     # Get position of selected node
-    selected_index = selected_indices[0]
+    selected_index = next(iter(extracted_layer.selected_data))
     selected_pos = extracted_layer.data[selected_index]
 
-    # Find node in dataframe by matching position
-    node_positions = nd_pdf['Position(ZXY)'].tolist()
-    node_positions_parsed = [get_float_pos_comma(str(pos)) for pos in node_positions]
+    # Find node in dataframe via the O(1) exact-match position map
+    # instead of re-parsing the whole Position(ZXY) column per click
+    if (app_state.node_positions_arr is None
+            or len(app_state.node_ids_arr) != len(nd_pdf)):
+        app_state.rebuild_node_arrays()
+    iloc = app_state.pos_to_iloc.get(
+        tuple(np.round(np.asarray(selected_pos, dtype=np.float32), 6)))
 
-    node_df_index = None
-    node_id = None
-    for idx, pos in enumerate(node_positions_parsed):
-        if np.array_equal(pos, selected_pos):
-            node_df_index = nd_pdf.index[idx]
-            node_id = nd_pdf.loc[node_df_index, 'Node ID']
-            break
-
-    if node_df_index is None or node_id is None:
+    if iloc is None:
         widget.log_status("Could not find selected node in dataframe.")
         return
-
-    # Get neighbors of the node to be removed
-    neighbor_ids_str = nd_pdf.loc[node_df_index, 'Neighbour ID']
-    if pd.isna(neighbor_ids_str) or neighbor_ids_str == '[]':
-        neighbor_ids = []
-    else:
-        neighbor_ids = get_float_pos_comma(str(neighbor_ids_str))
-
-    # Update all neighbors to remove this node from their adjacency lists
+    node_df_index = nd_pdf.index[iloc]
+    node_id = nd_pdf.at[node_df_index, 'Node ID']
+
+    # Get neighbors of the node to be removed (cells hold native lists
+    # in memory; the parser also tolerates legacy string cells)
+    neighbor_ids = app_state._parse_neighbour_cell(
+        nd_pdf.at[node_df_index, 'Neighbour ID'])
+
+    # Update all neighbors to remove this node from their adjacency
+    # lists; a prebuilt id -> row-index dict replaces the full column
+    # scan pandas ran per neighbour
+    id_to_df_index = {int(v): idx for v, idx in
+                      zip(nd_pdf['Node ID'], nd_pdf.index)}
     for neighbor_id in neighbor_ids:
         # Find the neighbor in the dataframe
-        neighbor_rows = nd_pdf[nd_pdf['Node ID'] == neighbor_id]
-        if len(neighbor_rows) == 0:
+        neighbor_df_index = id_to_df_index.get(int(neighbor_id))
+        if neighbor_df_index is None:
             continue
 
-        neighbor_df_index = neighbor_rows.index[0]
-
         # Get neighbor's adjacency list
-        neighbor_adj_str = nd_pdf.loc[neighbor_df_index, 'Neighbour ID']
-        if pd.isna(neighbor_adj_str) or neighbor_adj_str == '[]':
-            neighbor_adj_list = []
-        else:
-            neighbor_adj_list = get_float_pos_comma(str(neighbor_adj_str))
+        neighbor_adj_list = app_state._parse_neighbour_cell(
+            nd_pdf.at[neighbor_df_index, 'Neighbour ID'])
 
         # Remove the deleted node from neighbor's list
         if node_id in neighbor_adj_list:
             neighbor_adj_list.remove(node_id)
 
         # Update neighbor's adjacency list and degree
-        nd_pdf.loc[neighbor_df_index, 'Neighbour ID'] = str(neighbor_adj_list)
-        nd_pdf.loc[neighbor_df_index, 'Degree of Node'] = len(neighbor_adj_list)
+        nd_pdf.at[neighbor_df_index, 'Neighbour ID'] = neighbor_adj_list
+        nd_pdf.at[neighbor_df_index, 'Degree of Node'] = len(neighbor_adj_list)
 
-    # Remove the node from dataframe
+    # Remove the node from dataframe and close the hole in the index:
+    # the edit paths mix positional lookups with label-based .at writes,
+    # so a gap between them would corrupt later edits on the fast path
+    # below (which skips the reload that used to repair the index)
     nd_pdf.drop(node_df_index, inplace=True)
+    nd_pdf.reset_index(drop=True, inplace=True)
 
     # Update app state
     app_state.node_dataframe = nd_pdf
 
     # Save to CSV
-    nd_pdf.to_csv(node_path, index=False)
+    app_state.dirty = True
+    app_state.save_if_dirty()
+    app_state.rebuild_node_arrays()
+
+    if not neighbor_ids:
+        # Isolated node: no edge lines or neighbour colours change, so
+        # drop its point and colour in place instead of reloading the
+        # whole viewer from the Nellie output
+        data = np.asarray(extracted_layer.data)
+        colors_arr = np.asarray(extracted_layer.face_color)
+        keep = np.ones(len(data), dtype=bool)
+        keep[selected_index] = False
+        extracted_layer.selected_data = set()
+        extracted_layer.data = data[keep]
+        extracted_layer.face_color = colors_arr[keep]
+        # Keep the decimation cache in step with the layer, otherwise
+        # the next zoom-triggered swap would resurrect the removed node
+        app_state.full_node_positions = data[keep]
+        app_state.full_node_colors = colors_arr[keep]
+        # Force the insert path to reseed its append buffers
+        app_state._points_buf = None
+        app_state._points_len = 0
+
+        # Revert the skeleton voxel under the node to a plain voxel
+        soa = app_state.skeleton_soa
+        if soa is not None and len(soa.pos) > 0 and 'Skeleton' in viewer.layers:
+            skel_mask = (soa.pos == np.asarray(selected_pos, dtype=np.float32)).all(axis=1)
+            if skel_mask.any():
+                soa.rgba[skel_mask] = (255, 0, 0, 255)
+                soa.kind[skel_mask] = -1
+                viewer.layers['Skeleton'].face_color = soa.rgba
+
+        widget.log_status(f"Removed node (ID: {node_id}) at position {selected_pos}")
+        return
 
-    # Reload visualization to show updated network properly
+    # The node had edges, so neighbour colours and edge lines are stale:
+    # reload the visualization from the saved table
     viewer.layers.clear()
 
     raw_im, skel_im, face_colors, positions, colors, edge_lines = load_image_and_skeleton(
@@ -120,7 +151,7 @@ def remove_node(viewer, widget):
         )
 
         # Add extracted nodes if available
-        if positions and colors:
+        if len(positions) > 0 and len(colors) > 0:
             app_state.points_layer = viewer.add_points(
                 positions,
                 size=5,
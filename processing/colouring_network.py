@@ -9,31 +9,34 @@ from scipy.ndimage import label as labell
 from collections import Counter
 
 import re
+
+# Compiled once; re.split would re-hash the pattern on every call
+_POS_RE = re.compile(r'[ \[\,\]]')
+
 def get_float_pos_comma(st):
     """Parse string representation of position to get coordinates.
-    
+
     Args:
         st (str): String containing position coordinates
-        
+
     Returns:
         list: List of integer coordinates
     """
-    st = re.split(r'[ \[\,\]]', st)
-    pos = [int(element) for element in st if element != '']
-    return pos
+    return [int(element) for element in _POS_RE.split(st) if element]
 
 def get_edge_colours(mask_path,extracted_path,op_path):
 
     G = nx.MultiGraph()
     ext_df = pd.read_csv(extracted_path)
-    nodes_id = ext_df['node'].tolist()
-    pos = ext_df['Position(ZXY)'].tolist()
+    # Raw column arrays; materializing Python lists copies every cell
+    # through the object layer
+    nodes_id = ext_df['node'].to_numpy()
+    pos = ext_df['Position(ZXY)'].to_numpy()
     mask = imread(mask_path)
     print(np.shape(mask))
     mask_l, num_feat = labell(mask)
     print(np.shape(mask_l))
     print(num_feat)
-    srcs = []
     edges = []
     
     regions = (np.unique(mask_l[np.nonzero(mask)]))
@@ -47,45 +50,53 @@ def get_edge_colours(mask_path,extracted_path,op_path):
         if min_val_pixs>max_value_pixs: mother_value = np.min(regions); daughter_value = np.max(regions)
         else:  mother_value = np.max(regions); daughter_value = np.min(regions)
 
-    for i_n,i in enumerate(nodes_id):
-        srcs.append(i)
-
-        neighbours = ext_df['Neighbour ID'].apply(ast.literal_eval)[i_n]
-        
-        neighbours_counts = Counter(neighbours)
-        pos_n1 = get_float_pos_comma(pos[i_n])
-        pos_x_n1 = pos_n1[1]
-        pos_y_n1 = pos_n1[2]
-
-        for neighbour,count in neighbours_counts.items():
-            nn = nodes_id.index(neighbour)
-            if (neighbour not in srcs) or (neighbour == i):
-                
-                pos_n2 = get_float_pos_comma(pos[nn])
-                pos_x_n2 = pos_n2[1]
-                pos_y_n2 = pos_n2[2]
-
-                print(pos_n1,pos_n2)
-                print(np.shape(mask))
-                print(np.shape(mask_l))
-                r_n1 = mask_l[(pos_y_n1),(pos_x_n1)]
-                r_n2 = mask_l[(pos_y_n2),(pos_x_n2)]
-
-                if len(regions)==1: #if only mother present
-                    colour = 'red'    
-                else:
-                    if r_n1 == r_n2: #if both are in the same region
-                        if r_n1 == mother_value: colour = 'red' #same region being mother
-                        else: colour = 'green' #same region being daughter
-                    else:                            
-                            if r_n1 == 0.0 or r_n2 == 0.0: 
-                                r_c = np.nonzero([r_n1,r_n2])
-                                if r_c == mother_value: colour = 'red' #by default put in mother
-                                else: colour = 'green'
-                            else:
-                                    colour = 'yellow'
-                for _ in range(count):
-                        edges.append([i,neighbour,{'colour':colour}])    
+    # Parse the columns once up front: the neighbour column used to be
+    # re-parsed in full on every outer iteration and nodes_id.index()
+    # made each inner lookup a linear scan
+    neighbours_all = ext_df['Neighbour ID'].map(ast.literal_eval).tolist()
+    id_to_index = {int(nid): i for i, nid in enumerate(nodes_id)}
+    positions_arr = np.array([get_float_pos_comma(p) for p in pos], dtype=np.int64)
+
+    # Collect each undirected edge once (a neighbour at an earlier row
+    # was already emitted when that row was the source; self-loops pass)
+    src_idx = []
+    dst_idx = []
+    counts = []
+    for i_n in range(len(nodes_id)):
+        for neighbour,count in Counter(neighbours_all[i_n]).items():
+            nn = id_to_index[neighbour]
+            if nn >= i_n:
+                src_idx.append(i_n)
+                dst_idx.append(nn)
+                counts.append(count)
+
+    src_idx = np.asarray(src_idx, dtype=np.int64)
+    dst_idx = np.asarray(dst_idx, dtype=np.int64)
+
+    if len(src_idx) > 0:
+        # Classify every edge in one gather over the labelled mask
+        # instead of two scalar reads plus branching per edge
+        xs = positions_arr[:, 1]
+        ys = positions_arr[:, 2]
+        r_src = mask_l[ys[src_idx], xs[src_idx]]
+        r_dst = mask_l[ys[dst_idx], xs[dst_idx]]
+
+        if len(regions) == 1: #if only mother present
+            colours = np.full(len(src_idx), 'red', dtype=object)
+        else:
+            same = r_src == r_dst
+            #same region: red for mother, green for daughter; different
+            #regions: green when one endpoint is off-mask, else yellow
+            colours = np.where(
+                same,
+                np.where(r_src == mother_value, 'red', 'green'),
+                np.where((r_src == 0) | (r_dst == 0), 'green', 'yellow'))
+
+        for k in range(len(src_idx)):
+            edge = [int(nodes_id[src_idx[k]]), int(nodes_id[dst_idx[k]]),
+                    {'colour': str(colours[k])}]
+            for _ in range(counts[k]):
+                edges.append(edge)
 
     G.add_edges_from(edges)
     nx.write_edgelist(G, op_path)
@@ -10,8 +10,8 @@ import numpy as np
 from tifffile import imread
 from napari.utils.notifications import show_info, show_warning, show_error
 from scipy.ndimage import label as labell
+from scipy.ndimage import find_objects
 from utils.adjacency_reader import adjacency_to_extracted
-import networkx as nx
 import csv
 
 def get_network(pixel_class_path):
@@ -35,7 +35,10 @@ def get_network(pixel_class_path):
         
         # Load the skeleton image
         skeleton = imread(pixel_class_path)
-        skeleton = np.transpose(skeleton)
+        # Copy the transposed view into C order once: every later label
+        # pass and mask walks the volume stride-1 instead of through the
+        # reversed strides of the lazy transpose
+        skeleton = np.ascontiguousarray(np.transpose(skeleton))
         show_info(f"Skeleton shape: {np.shape(skeleton)}")
         
         # Define 3D connectivity structure
@@ -49,126 +52,155 @@ def get_network(pixel_class_path):
         skeleton[skeleton == 2] = 4  # Tips
         skeleton[skeleton == 1] = 4  # Lone-tips
         
+        # Boolean masks feed labell directly; the old np.where calls
+        # allocated two extra int volumes the size of the skeleton
+        nodes_mask = skeleton == 4
+
         # Extract edges (all voxels except nodes)
-        no_nodes = np.where(skeleton == 4, 0, skeleton)
-        edges, num_edges = labell(no_nodes > 0, structure=struct)
+        edges_mask = (skeleton > 0) & ~nodes_mask
+        edges, num_edges = labell(edges_mask, structure=struct)
         show_info(f"Found {num_edges} edges")
-        
+
         # Extract nodes
-        nodes = np.where(skeleton == 4, 4, 0)
-        node_labels, num_nodes = labell(nodes > 0, structure=struct)
+        node_labels, num_nodes = labell(nodes_mask, structure=struct)
         show_info(f"Found {num_nodes} nodes")
         
-        # Map nodes to their connected edges
-        node_edges = {}
         node_positions = {}
-        
-        # For each node, find connected edges
+
+        # One pass gives every node's bounding box, so the per-node
+        # masking below touches only the box instead of the full volume
+        bboxes = find_objects(node_labels)
+
+        # For each node, record a representative position
         for j_id in range(1, num_nodes + 1):
-            # Get coordinates of all voxels in this node
-            j_coords = np.argwhere(node_labels == j_id)
-            
-            # Track edges connected to this node
-            connected_edges = set()
-            
-            if len(j_coords) > 0:
-                # Take the first voxel's coordinates
-                x, y, z = j_coords[0]
-                node_positions[j_id] = (x, y, z)
-            else:
+            sl = bboxes[j_id - 1]
+            if sl is None:
                 # Fallback if node has no voxels (shouldn't happen)
                 node_positions[j_id] = (0, 0, 0)
-            
-            
-            # Check 3x3x3 neighborhood around each node voxel
-            for (x, y, z) in j_coords:
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        for dz in [-1, 0, 1]:
-                            # Skip the center voxel
-                            if dx == 0 and dy == 0 and dz == 0:
-                                continue
-                                
-                            # Neighbor coordinates
-                            xx, yy, zz = x + dx, y + dy, z + dz
-                            
-                            # Check bounds
-                            if (0 <= xx < skeleton.shape[0] and
-                                0 <= yy < skeleton.shape[1] and
-                                0 <= zz < skeleton.shape[2]):
-                                
-                                # If neighbor is part of an edge, add to connected edges
-                                edge_label = edges[xx, yy, zz]
-                                if edge_label != 0:
-                                    connected_edges.add(edge_label)
-            
-            # Store edges connected to this node
-            node_edges[j_id] = connected_edges
-        
-        # Map edges to connected nodes
-        edge_nodes = {}
-        for n_id, e_set in node_edges.items():
-            for e_id in e_set:
-                if e_id not in edge_nodes:
-                    edge_nodes[e_id] = set()
-                edge_nodes[e_id].add(n_id)
-        
-        # Create network graph
-        G = nx.MultiGraph()
-        
-        # Add all nodes to graph
-        for j_id in range(1, num_nodes + 1):
-            x, y, z = node_positions[j_id]
-            G.add_node(j_id, pos_x=x, pos_y=y, pos_z=z)
+                continue
+
+            sub_mask = node_labels[sl] == j_id
+
+            # Take the first voxel's coordinates; argmax finds it
+            # without materializing every voxel coordinate
+            local = np.unravel_index(int(np.argmax(sub_mask)), sub_mask.shape)
+            node_positions[j_id] = (sl[0].start + local[0],
+                                    sl[1].start + local[1],
+                                    sl[2].start + local[2])
+
+        # Node/edge incidence gathered as (node_label, edge_label) pairs
+        # with one shifted-slice comparison per 26-neighbourhood offset.
+        # This stays vectorized but, unlike a dilated max over the edge
+        # labels, keeps every edge touching a node voxel even when
+        # several distinct edges meet at the same voxel
+        pair_nodes = []
+        pair_edges = []
+        dims = skeleton.shape
+        for dz in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if dz == 0 and dy == 0 and dx == 0:
+                        continue
+                    node_sl = tuple(slice(max(0, -o), min(n, n - o))
+                                    for o, n in zip((dz, dy, dx), dims))
+                    edge_sl = tuple(slice(max(0, o), min(n, n + o))
+                                    for o, n in zip((dz, dy, dx), dims))
+                    n_lab = node_labels[node_sl]
+                    e_lab = edges[edge_sl]
+                    hit = (n_lab != 0) & (e_lab != 0)
+                    if hit.any():
+                        pair_nodes.append(n_lab[hit].astype(np.int64))
+                        pair_edges.append(e_lab[hit].astype(np.int64))
+
+        # De-duplicate the pairs, then invert the node->edge incidence
+        # into per-edge node groups with one stable sort
+        if pair_nodes:
+            pairs = np.unique(
+                np.stack((np.concatenate(pair_nodes),
+                          np.concatenate(pair_edges))), axis=1)
+            incidence_nodes = pairs[0]
+            incidence_edges = pairs[1]
+        else:
+            incidence_nodes = np.empty(0, dtype=np.int64)
+            incidence_edges = np.empty(0, dtype=np.int64)
+        order = np.argsort(incidence_edges, kind='stable')
+        incidence_nodes = incidence_nodes[order]
+        incidence_edges = incidence_edges[order]
+        group_bounds = np.flatnonzero(np.diff(incidence_edges)) + 1
+        group_starts = np.concatenate(([0], group_bounds))
+        group_ends = np.concatenate((group_bounds, [len(incidence_edges)]))
+
+        # Expand each edge into node pairs once; adjacency and the
+        # connected components are derived from this list without
+        # building a MultiGraph
+        edge_pairs = []
+        for start, end in zip(group_starts, group_ends):
+            if start == end:
+                continue
+            e_id = int(incidence_edges[start])
+            cn = incidence_nodes[start:end].tolist()
 
-        
-        # Add edges between nodes
-        for e_id, connected_nodes in edge_nodes.items():
-            cn = list(connected_nodes)
-            
             if len(cn) == 2:
                 # Standard edge between two nodes
-                n1, n2 = cn
-                G.add_edge(n1, n2, edge_id=e_id)
+                edge_pairs.append((cn[0], cn[1], e_id))
             elif len(cn) == 1:
                 # Self-loop (edge connects to same node)
-                (n1,) = cn
-                G.add_edge(n1, n1, edge_id=e_id)
+                edge_pairs.append((cn[0], cn[0], e_id))
             elif len(cn) > 2:
                 # Edge connects multiple nodes - add edges between all pairs
                 for i in range(len(cn)):
                     for j in range(i + 1, len(cn)):
-                        G.add_edge(cn[i], cn[j], edge_id=e_id)
-        
-        # Find connected components (separate trees)
-        components = list(nx.connected_components(G))
-        show_info(f"Found {len(components)} connected components")
-        
+                        edge_pairs.append((cn[i], cn[j], e_id))
+
+        # Neighbour sets per node (self-loops keep the node itself, as
+        # the old graph adjacency did)
+        adjacency = {j_id: set() for j_id in range(1, num_nodes + 1)}
+        for n1, n2, _ in edge_pairs:
+            adjacency[n1].add(n2)
+            adjacency[n2].add(n1)
+
+        # Find connected components (separate trees) with a union-find
+        # over a flat int array
+        parent = np.arange(num_nodes + 1)
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]  # path halving
+                x = parent[x]
+            return int(x)
+
+        for n1, n2, _ in edge_pairs:
+            root_a, root_b = find(n1), find(n2)
+            if root_a != root_b:
+                parent[root_a] = root_b
+
+        components = {}
+        for j_id in range(1, num_nodes + 1):
+            components.setdefault(find(j_id), []).append(j_id)
+        # Order components by their lowest node id, matching the old
+        # networkx enumeration; member lists are already ascending
+        component_list = sorted(components.values(), key=lambda comp: comp[0])
+        show_info(f"Found {len(component_list)} connected components")
+
         # Write adjacency list to CSV
         with open(adjc_path, "w", newline="") as f:
             writer = csv.writer(f)
             # Header row
             writer.writerow(["component_num", "node", "pos_x", "pos_y", "pos_z", "adjacencies"])
-            
+
             # Write each component
-            for comp_num, comp in enumerate(components, start=1):
-                # Create subgraph for this component
-                subG = G.subgraph(comp).copy()
-                
+            for comp_num, comp in enumerate(component_list, start=1):
                 # For each node, write its adjacencies
-                for node in sorted(subG.nodes()):
-                    
-                    # Get node attributes (positions)
-                    pos_x = subG.nodes[node]['pos_x']
-                    pos_y = subG.nodes[node]['pos_y']
-                    pos_z = subG.nodes[node]['pos_z']
-                    
-                    adjacencies = sorted(list(subG[node]))
+                for node in comp:
+                    pos_x, pos_y, pos_z = node_positions[node]
+                    adjacencies = sorted(adjacency[node])
                     writer.writerow([comp_num, node, pos_x, pos_y, pos_z, adjacencies])
-            
-        
-        # Write edge list
-        nx.write_edgelist(G, edge_path)
+
+
+        # Write edge list in the networkx edgelist format
+        with open(edge_path, "w") as f:
+            for n1, n2, e_id in edge_pairs:
+                f.write(f"{n1} {n2} {{'edge_id': {e_id}}}\n")
         
         extr_path = os.path.join(os.path.dirname(pixel_class_path), f"{base_name}_extracted.csv")
         adjacency_to_extracted(extr_path, adjc_path)
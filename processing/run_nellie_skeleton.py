@@ -16,6 +16,9 @@ try:
 except ImportError:
     NELLIE_AVAILABLE = False
 from napari.utils.notifications import show_info, show_warning, show_error
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import json
 import os
 import logging
 from app_state import app_state
@@ -40,9 +43,33 @@ def run_nellie_processing(im_path, num_t=None, remove_edges=False, ch=0):
     try:
         # Initialize FileInfo, load metadata and set dimension resolutions
         file_info = FileInfo(im_path)
-        # read file metadata and populate axes/shape/dim_res
-        file_info.find_metadata()
-        file_info.load_metadata()
+        # Probing TIFF headers is expensive on network filesystems, so
+        # the probed axes/shape are cached in a sidecar keyed on the
+        # source file's mtime; any sidecar problem falls back to probing
+        meta_sidecar = im_path + '.nellie_meta.json'
+        meta = None
+        try:
+            with open(meta_sidecar) as f:
+                cached = json.load(f)
+            if cached.get('mtime') == os.path.getmtime(im_path):
+                meta = cached
+        except (OSError, ValueError, KeyError):
+            meta = None
+
+        if meta is not None:
+            file_info.axes = meta['axes']
+            file_info.shape = tuple(meta['shape'])
+        else:
+            # read file metadata and populate axes/shape/dim_res
+            file_info.find_metadata()
+            file_info.load_metadata()
+            try:
+                with open(meta_sidecar, 'w') as f:
+                    json.dump({'axes': file_info.axes,
+                               'shape': list(file_info.shape),
+                               'mtime': os.path.getmtime(im_path)}, f)
+            except (OSError, TypeError):
+                pass
 
         # Set dimension sizes from GUI resolution settings
         # use change_dim_res to ensure FileInfo internal validation runs
@@ -111,4 +138,64 @@ def run_nellie_processing(im_path, num_t=None, remove_edges=False, ch=0):
     
     except Exception as e:
         show_error(f"Error in Nellie processing: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+
+def _run_nellie_worker(im_path, num_t, remove_edges, ch, resolutions):
+    """Process-pool worker: apply the caller's resolutions, then run.
+
+    Under spawn-based multiprocessing the worker re-imports app_state
+    with its defaults, so the parent's GUI-configured values must travel
+    with the task rather than ride on inherited module state.
+    """
+    (app_state.z_resolution,
+     app_state.y_resolution,
+     app_state.x_resolution) = resolutions
+    return run_nellie_processing(im_path, num_t, remove_edges, ch)
+
+
+def run_nellie_batch(im_paths, num_t=None, remove_edges=False, ch=0, max_workers=None):
+
+    """Run the Nellie pipeline on several images in parallel.
+
+    The Filter/Label/Network stages are independent across files, so each
+    image is dispatched to its own worker process and the batch scales
+    with core count. Summary notifications stay in the parent process.
+
+    Args:
+        im_paths (list): Paths to the input image files
+        num_t (int, optional): Number of time points
+        remove_edges (bool): Whether to remove edge artifacts
+        ch (int): Channel number to process
+        max_workers (int, optional): Worker process cap; defaults to half
+            the available cores
+
+    Returns:
+        list: Per-image run_nellie_processing results in input order
+              (None where a run failed)
+    """
+    if not NELLIE_AVAILABLE:
+        show_error("Nellie library is required for processing. Please install it first.")
+        return [None] * len(im_paths)
+
+    if not im_paths:
+        return []
+
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 2) // 2)
+    max_workers = max(1, min(max_workers, len(im_paths)))
+
+    resolutions = (app_state.z_resolution,
+                   app_state.y_resolution,
+                   app_state.x_resolution)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(
+            _run_nellie_worker,
+            im_paths,
+            itertools.repeat(num_t),
+            itertools.repeat(remove_edges),
+            itertools.repeat(ch),
+            itertools.repeat(resolutions)))
+
+    show_info(f"Batch processing complete for {len(im_paths)} images")
+    return results
\ No newline at end of file
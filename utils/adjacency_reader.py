@@ -7,39 +7,42 @@ Created on Mon Mar 10 17:24:00 2025
 """
 import os
 import pandas as pd
-from .parsing import get_float_pos_comma
+
+# pandas' pyarrow engine parses CSVs multithreaded; fall back to the
+# default engine when pyarrow is not installed
+try:
+    import pyarrow  # noqa: F401
+    CSV_READ_KWARGS = {'engine': 'pyarrow'}
+except ImportError:
+    CSV_READ_KWARGS = {}
 
 def adjacency_to_extracted(extracted_csv_path,adjacency_path):
-    
-    adj_df = pd.read_csv(adjacency_path)
+
+    adj_df = pd.read_csv(adjacency_path, **CSV_READ_KWARGS)
     if os.path.exists(extracted_csv_path):
-        ext_df = pd.read_csv(extracted_csv_path)
+        ext_df = pd.read_csv(extracted_csv_path, **CSV_READ_KWARGS)
     else:
         ext_df={}
-        
-    # Parse adjacency strings and positions
-    node_id = adj_df['node'].tolist()
-    adjs_list = adj_df['adjacencies'].tolist()
-    pos_x = adj_df['pos_x'].tolist()
-    pos_y = adj_df['pos_y'].tolist()
-    pos_z = adj_df['pos_z'].tolist()
-
-    # Build lists for extracted rows only for nodes that have at least one adjacency
-    degrees = []
-    positions = []
-    neighbours = []
-    id = []
-    for i_n, adj_str in enumerate(adjs_list):
-        neighs = get_float_pos_comma(adj_str)
-        if len(neighs) > 0:
-            id.append(node_id[i_n])
-            degrees.append(len(neighs))
-            positions.append([pos_z[i_n], pos_y[i_n], pos_x[i_n]])
-            neighbours.append(neighs)
-    ext_df['Node ID'] = id
-    ext_df['Degree of Node'] = degrees
-    ext_df['Position(ZXY)'] = positions
-    ext_df['Neighbour ID'] = neighbours
+
+    # Parse every adjacency string in one vectorized pass and keep only
+    # the nodes that have at least one adjacency
+    neigh_series = (adj_df['adjacencies'].astype(str)
+                    .str.findall(r'\d+')
+                    .map(lambda xs: [int(x) for x in xs]))
+    degrees = neigh_series.str.len()
+    mask = degrees > 0
+
+    pos_arr = adj_df.loc[mask, ['pos_z', 'pos_y', 'pos_x']].to_numpy()
+
+    ext_df['Node ID'] = adj_df.loc[mask, 'node'].tolist()
+    ext_df['Degree of Node'] = degrees[mask].tolist()
+    ext_df['Position(ZXY)'] = pos_arr.tolist()
+    ext_df['Neighbour ID'] = neigh_series[mask].tolist()
+    # Numeric copies of the coordinates alongside the stringified list;
+    # readers that understand them skip re-parsing Position(ZXY)
+    ext_df['pos_z'] = pos_arr[:, 0]
+    ext_df['pos_y'] = pos_arr[:, 1]
+    ext_df['pos_x'] = pos_arr[:, 2]
 
     ext_df = pd.DataFrame.from_dict(ext_df)
 
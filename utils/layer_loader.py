@@ -8,7 +8,7 @@ Created on Mon Mar 10 17:14:32 2025
 from tifffile import imread
 import os
 from napari.utils.notifications import show_info, show_warning, show_error
-from .adjacency_reader import adjacency_to_extracted
+from .adjacency_reader import adjacency_to_extracted, CSV_READ_KWARGS
 import pandas as pd
 from app_state import app_state
 import numpy as np
@@ -16,6 +16,21 @@ from .parsing import get_float_pos_comma
 import glob
 import ast
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+
+@dataclass
+class SkeletonSoA:
+    """Structure-of-arrays view of the skeleton points layer.
+
+    The three attributes are parallel contiguous ndarrays so napari can
+    consume them without per-point conversion and handlers can select
+    subsets with boolean masks instead of Python-level loops.
+    """
+    pos: np.ndarray   # (N, 3) float32 voxel coordinates
+    rgba: np.ndarray  # (N, 4) uint8 face colors
+    kind: np.ndarray  # (N,) int8 node degree at the voxel (-1 = plain skeleton)
 
 
 def trace_skeleton_path(start_pos, end_pos, skeleton_coords):
@@ -106,38 +121,39 @@ def generate_edge_lines(node_df, skeleton_coords=None):
     if node_df.empty:
         return edge_lines
 
+    # Iterate over the raw column arrays; iterrows would rebuild a
+    # Series object per row
+    node_ids_col = node_df['Node ID'].values
+    positions_col = node_df['Position(ZXY)'].values
+    neighbours_col = node_df['Neighbour ID'].values
+
     # Create a mapping from node ID to position
-    node_id_to_pos = {}
-    for idx, row in node_df.iterrows():
-        node_id = row['Node ID']
-        pos_str = row['Position(ZXY)']
-        pos = get_float_pos_comma(pos_str)
-        node_id_to_pos[node_id] = pos
+    node_id_to_pos = {node_id: get_float_pos_comma(pos_str)
+                      for node_id, pos_str in zip(node_ids_col, positions_col)}
 
     # Determine if we should trace paths or use straight lines
     use_path_tracing = skeleton_coords is not None and len(skeleton_coords) > 0
 
     # Generate edges
-    for idx, row in node_df.iterrows():
-        node_id = row['Node ID']
+    for node_id, neighbour_cell in zip(node_ids_col, neighbours_col):
         pos = node_id_to_pos[node_id]
 
-        # Parse neighbor IDs
-        neighbor_str = str(row['Neighbour ID'])
-        if neighbor_str == 'nan' or neighbor_str == '[]':
-            continue
-
+        # Parse neighbor IDs; cells are usually native lists already, so
+        # this avoids round-tripping them through str + ast.literal_eval
         try:
-            neighbor_ids = ast.literal_eval(neighbor_str)
-            if not isinstance(neighbor_ids, list):
-                neighbor_ids = [neighbor_ids]
-        except:
+            neighbor_ids = app_state._parse_neighbour_cell(neighbour_cell)
+        except (ValueError, TypeError):
+            continue
+        if not neighbor_ids:
             continue
 
         # Create edges to neighbors
         for neighbor_id in neighbor_ids:
-            # Create unique edge identifier (sorted to avoid duplicates)
-            edge_id = tuple(sorted([node_id, neighbor_id]))
+            # Create unique edge identifier packed into a single int
+            # (canonical min/max order avoids duplicates and hashes in
+            # one step instead of tuple-hashing two elements)
+            u, v = int(node_id), int(neighbor_id)
+            edge_id = (u << 32) | v if u < v else (v << 32) | u
 
             # Skip if edge already processed
             if edge_id in processed_edges:
@@ -160,6 +176,103 @@ def generate_edge_lines(node_df, skeleton_coords=None):
     return edge_lines
 
 
+# Point colors as uint8 RGBA rows: napari/VisPy uploads float32 to the
+# GPU, so handing it uint8 arrays instead of color-name lists skips the
+# per-point name resolution and halves host-side color memory
+_COLOR_RGBA = {
+    'red': (255, 0, 0, 255),
+    'blue': (0, 0, 255, 255),
+    'white': (255, 255, 255, 255),
+    'magenta': (255, 0, 255, 255),
+    'green': (0, 128, 0, 255),
+}
+
+# Node color by degree, indexable by np.clip(degree, 0, 3): isolated,
+# endpoint, pass-through, junction (3+)
+_DEG_COLOR_LUT = np.array([_COLOR_RGBA['white'],
+                           _COLOR_RGBA['blue'],
+                           _COLOR_RGBA['magenta'],
+                           _COLOR_RGBA['green']], dtype=np.uint8)
+
+
+def _pack_edge_lines(edge_lines):
+    """Convert edge paths to float32 ndarrays for napari's Shapes layer.
+
+    When every path has the same number of vertices (the common straight
+    two-endpoint case) the whole set is packed into one contiguous
+    (N, L, 3) array so it can be uploaded in a single conversion;
+    otherwise each path is converted once here instead of per-add.
+    """
+    if not edge_lines:
+        return edge_lines
+    lengths = {len(path) for path in edge_lines}
+    if len(lengths) == 1:
+        return np.asarray(edge_lines, dtype=np.float32)
+    return [np.asarray(path, dtype=np.float32) for path in edge_lines]
+
+
+def _read_node_table(csv_path):
+    """Read the node table, preferring the Feather sidecar when fresh.
+
+    save_if_dirty writes a Feather copy next to the CSV; reading it back
+    skips CSV parsing and restores the neighbour lists as native list
+    cells. The CSV stays canonical, so the sidecar is only trusted when
+    it is at least as new as the CSV.
+    """
+    feather_path = os.path.splitext(csv_path)[0] + '.feather'
+    try:
+        if (os.path.exists(feather_path)
+                and os.path.getmtime(feather_path) >= os.path.getmtime(csv_path)):
+            return pd.read_feather(feather_path)
+    except Exception:
+        pass
+    return pd.read_csv(csv_path, **CSV_READ_KWARGS)
+
+
+# Normalized node tables keyed by path; each entry remembers the file
+# mtime it was read at so edits on disk invalidate it automatically
+_NODE_TABLE_CACHE = {}
+
+
+def _load_and_normalize_nodes(csv_path):
+    """Read the node table and normalize it once per (path, mtime).
+
+    The loader consults the table at up to three points per call; this
+    hands back the same normalized frame (canonical 'Node ID' int column,
+    neighbour cells as native lists) instead of re-parsing the CSV and
+    re-applying the rename/astype block each time.
+    """
+    try:
+        mtime = os.path.getmtime(csv_path)
+    except OSError:
+        mtime = None
+    cached = _NODE_TABLE_CACHE.get(csv_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    node_df = _read_node_table(csv_path)
+    # ensure 'Node ID' column exists (create from index if missing)
+    if 'Node ID' not in node_df.columns:
+        if 'node' in node_df.columns:
+            node_df.rename(columns={'node': 'Node ID'}, inplace=True)
+        else:
+            node_df = node_df.reset_index(drop=True)
+            node_df['Node ID'] = node_df.index + 1
+    # coerce to int for consistency
+    try:
+        node_df['Node ID'] = node_df['Node ID'].astype(int)
+    except Exception:
+        pass
+    # Keep neighbour lists as native Python lists in memory so edits
+    # append/remove ints directly; pandas stringifies the cells on
+    # to_csv exactly as the old str() round-trip did
+    if 'Neighbour ID' in node_df.columns:
+        node_df['Neighbour ID'] = node_df['Neighbour ID'].map(
+            app_state._parse_neighbour_cell)
+    _NODE_TABLE_CACHE[csv_path] = (mtime, node_df)
+    return node_df
+
+
 def load_image_and_skeleton(nellie_output_path):
     """Load raw image and skeleton from Nellie output directory.
 
@@ -170,27 +283,33 @@ def load_image_and_skeleton(nellie_output_path):
         tuple: (raw_image, skeleton_image, face_colors, positions, colors, edge_lines)
     """
     try:
-        # Find relevant files in the output directory
-        tif_files = os.listdir(nellie_output_path)
-        
-        # Find raw image file (channel 0)
-        raw_files = [f for f in tif_files if f.endswith('-ch0.ome.tif')]
-        if not raw_files:
+        # Flush any deferred node-table edits before re-reading the CSV
+        app_state.save_if_dirty(force=True)
+
+        # Find the raw (channel 0) and skeleton files in one directory
+        # pass instead of listing every name and filtering it twice
+        raw_file = skel_file = None
+        with os.scandir(nellie_output_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if skel_file is None and name.endswith('-ch0-im_pixel_class.ome.tif'):
+                    skel_file = name
+                elif raw_file is None and name.endswith('-ch0.ome.tif'):
+                    raw_file = name
+                if raw_file and skel_file:
+                    break
+
+        if raw_file is None:
             show_error("No raw image file found in the output directory: " + nellie_output_path)
             return None, None, [], [], [], []
-            
-        raw_file = raw_files[0]
+
         basename = raw_file.split(".")[0]
-        
-        # Find skeleton image file
-        skel_files = [f for f in tif_files if f.endswith('-ch0-im_pixel_class.ome.tif')]
-        if not skel_files:
+
+        if skel_file is None:
             show_error("No skeleton file found in the output directory")
             return None, None, [], [], [], []
         else:
             app_state.nellie_output_path = nellie_output_path
-            
-        skel_file = skel_files[0]
         
         # Get full paths
         raw_im_path = os.path.join(nellie_output_path, raw_file)
@@ -201,88 +320,98 @@ def load_image_and_skeleton(nellie_output_path):
         adjacency_path = os.path.join(nellie_output_path, f"{basename}_adjacency_list.csv")
         if os.path.exists(node_path_extracted):
             app_state.node_path = node_path_extracted
-            app_state.node_dataframe = pd.read_csv(node_path_extracted) 
+            app_state.node_dataframe = _load_and_normalize_nodes(node_path_extracted)
 
         # Load images
         raw_im = imread(raw_im_path)
-        skel_im = imread(skel_im_path)
-        skel_im = np.transpose(np.nonzero(skel_im))
+
+        # The skeleton's nonzero coordinates are cached next to the TIFF
+        # so repeat viewer loads skip the TIFF decode and the full-volume
+        # nonzero scan; the cache is only trusted while it is at least as
+        # new as the source image
+        coords_path = os.path.join(nellie_output_path, f"{basename}_skel_coords.npy")
+        skel_im = None
+        try:
+            if (os.path.exists(coords_path)
+                    and os.path.getmtime(coords_path) >= os.path.getmtime(skel_im_path)):
+                skel_im = np.load(coords_path, mmap_mode='r')
+        except Exception:
+            skel_im = None
+        if skel_im is None:
+            skel_im = np.argwhere(imread(skel_im_path))
+            try:
+                np.save(coords_path, skel_im)
+            except Exception:
+                pass
 
         # Store skeleton coordinates in app_state for point insertion
         app_state.skeleton_coords = skel_im
 
-        # Default all points to red
-        face_color_arr = ['red' for _ in range(len(skel_im))]
+        # Default all points to red, no voxel marked as a node yet; the
+        # arrays are shared with the SkeletonSoA below and mutated in
+        # place when node matches are found
+        face_color_arr = np.tile(np.array(_COLOR_RGBA['red'], dtype=np.uint8),
+                                 (len(skel_im), 1))
+        kind_arr = np.full(len(skel_im), -1, dtype=np.int8)
+        app_state.skeleton_soa = SkeletonSoA(
+            pos=np.ascontiguousarray(skel_im, dtype=np.float32),
+            rgba=face_color_arr,
+            kind=kind_arr)
         
         #Check if an adjaceny list exists and convert to extracted csv if so
         if os.path.exists(adjacency_path) and not os.path.exists(node_path_extracted):
             adjacency_to_extracted(node_path_extracted,adjacency_path)
         
         if os.path.exists(adjacency_path) and os.path.exists(node_path_extracted):
-            node_df = pd.read_csv(node_path_extracted)
-            # ensure 'Node ID' column exists (create from index if missing)
-            if 'Node ID' not in node_df.columns:
-                if 'node' in node_df.columns:
-                    node_df.rename(columns={'node': 'Node ID'}, inplace=True)
-                else:
-                    node_df = node_df.reset_index(drop=True)
-                    node_df['Node ID'] = node_df.index + 1
-            # coerce to int for consistency
-            try:
-                node_df['Node ID'] = node_df['Node ID'].astype(int)
-            except Exception:
-                pass
-            app_state.node_dataframe = node_df            
+            node_df = _load_and_normalize_nodes(node_path_extracted)
+            app_state.node_dataframe = node_df
             if node_df.empty or pd.isna(node_df.index.max()):
                 adjacency_to_extracted(node_path_extracted,adjacency_path)
         
         # Process extracted nodes if available
         if os.path.exists(node_path_extracted):
-            node_df = pd.read_csv(node_path_extracted)
-            # ensure 'Node ID' column exists
-            if 'Node ID' not in node_df.columns:
-                if 'node' in node_df.columns:
-                    node_df.rename(columns={'node': 'Node ID'}, inplace=True)
-                else:
-                    node_df = node_df.reset_index(drop=True)
-                    node_df['Node ID'] = node_df.index + 1
-            try:
-                node_df['Node ID'] = node_df['Node ID'].astype(int)
-            except Exception:
-                pass
+            node_df = _load_and_normalize_nodes(node_path_extracted)
             app_state.node_dataframe = node_df
-            
+            app_state.rebuild_node_arrays()
+
             if not node_df.empty and not pd.isna(node_df.index.max()):
                 # Extract node positions and degrees
                 pos_extracted = node_df['Position(ZXY)'].values
                 show_info(f"Extracted positions: {pos_extracted}")
                 
                 deg_extracted = node_df['Degree of Node'].values.astype(int)
-                positions = [get_float_pos_comma(el) for el in pos_extracted]
-                # Generate colors based on node degree
-                colors = []
-                for i, degree in enumerate(deg_extracted):
-                    if degree == 1:
-                        colors.append('blue')  # Endpoint nodes
-                    elif degree == 0:
-                        colors.append('white')  # Isolated nodes
-                    elif degree == 2:
-                        colors.append('magenta')  
-                    else:
-                        colors.append('green')  # Junction nodes
-                #Map skeleton points to node colors if they match positions
-                position_color_map = {}
-                for i,pos in enumerate(positions):
-                    position_color_map[tuple(pos)] = colors[i]
-                #update face colors for skeleton points that match node positions
-                for i, point in enumerate(skel_im):
-                    point_tuple = tuple(point)
-                    if point_tuple in position_color_map:
-                        face_color_arr[i] = position_color_map[point_tuple]
+                # rebuild_node_arrays() above already batch-parsed the
+                # position column into one contiguous (N, 3) float32
+                # block, so reuse it instead of re-parsing every cell
+                positions = app_state.node_positions_arr
+                if positions is None or len(positions) != len(node_df):
+                    positions = np.ascontiguousarray(
+                        [get_float_pos_comma(el) for el in pos_extracted],
+                        dtype=np.float32)
+                # Generate colors based on node degree: one uint8 RGBA
+                # LUT gather instead of a Python branch per node
+                colors = _DEG_COLOR_LUT[np.clip(deg_extracted, 0, 3)]
+                #Map skeleton points to node colors if they match positions.
+                #Pack each (z, y, x) voxel into one int64 key and join the
+                #two key sets with a sorted binary search: a single
+                #C-level merge instead of a dict probe per skeleton voxel
+                if len(positions) > 0 and len(skel_im) > 0:
+                    skel_i = np.asarray(skel_im, dtype=np.int64)
+                    node_i = np.asarray(positions, dtype=np.int64)
+                    skel_keys = (skel_i[:, 0] << 42) | (skel_i[:, 1] << 21) | skel_i[:, 2]
+                    node_keys = (node_i[:, 0] << 42) | (node_i[:, 1] << 21) | node_i[:, 2]
+                    order = np.argsort(node_keys, kind='stable')
+                    node_keys_sorted = node_keys[order]
+                    idx = np.searchsorted(node_keys_sorted, skel_keys)
+                    idx = np.minimum(idx, len(node_keys_sorted) - 1)
+                    hit = node_keys_sorted[idx] == skel_keys
+                    src = order[idx[hit]]
+                    face_color_arr[hit] = colors[src]
+                    kind_arr[hit] = deg_extracted[src]
 
                 # Generate edge lines from node connectivity with path tracing
                 # Pass skeleton coordinates for curved path tracing
-                edge_lines = generate_edge_lines(node_df, skeleton_coords=skel_im)
+                edge_lines = _pack_edge_lines(generate_edge_lines(node_df, skeleton_coords=skel_im))
 
                 return raw_im, skel_im, face_color_arr, positions, colors, edge_lines
                 
@@ -290,11 +419,13 @@ def load_image_and_skeleton(nellie_output_path):
                 # Create empty dataframe if no data
                 app_state.node_dataframe = pd.DataFrame(columns=['Node ID','Degree of Node', 'Position(ZXY)'])
                 app_state.node_dataframe.to_csv(node_path_extracted, index=False)
+                app_state.rebuild_node_arrays()
                 return raw_im, skel_im, face_color_arr, [], [], []
         else:
             # Create new node file if none exists
             app_state.node_dataframe = pd.DataFrame(columns=['Node ID','Degree of Node', 'Position(ZXY)'])
             app_state.node_dataframe.to_csv(node_path_extracted, index=False)
+            app_state.rebuild_node_arrays()
             return raw_im, skel_im, face_color_arr, [], [], []
 
     except Exception as e:
@@ -334,30 +465,35 @@ def load_dynamics_events_layer(viewer, current_timepoint=None):
     all_properties = []
 
     try:
-        for csv_file, config in event_types.items():
-            csv_path = os.path.join(dynamics_folder, csv_file)
-
-            if os.path.exists(csv_path):
-                df = pd.read_csv(csv_path)
-
-                if df.empty:
-                    continue
-
-                # Extract points and filter by timepoint if specified
-                points, colors, properties = extract_event_points(df, config, current_timepoint, csv_file)
-
-                all_points.extend(points)
-                all_colors.extend(colors)
-                all_properties.extend(properties)
+        present = [(csv_file, config)
+                   for csv_file, config in event_types.items()
+                   if os.path.exists(os.path.join(dynamics_folder, csv_file))]
+
+        # The event CSVs are independent and IO-bound, so read them
+        # concurrently; map() keeps the original file order so the layer
+        # comes out identical to the serial loop
+        if present:
+            with ThreadPoolExecutor(max_workers=len(present)) as executor:
+                results = executor.map(
+                    lambda item: _read_and_extract(
+                        os.path.join(dynamics_folder, item[0]),
+                        item[1], current_timepoint, item[0]),
+                    present)
+
+                for points, colors, properties in results:
+                    if len(points):
+                        all_points.append(points)
+                    all_colors.extend(colors)
+                    all_properties.extend(properties)
 
         if all_points:
             # Remove existing dynamics events layer if it exists
-            layer_names = [layer.name for layer in viewer.layers]
-            if "Dynamic Events" in layer_names:
+            if "Dynamic Events" in viewer.layers:
                 viewer.layers.remove("Dynamic Events")
 
-            # Add new points layer
-            points_array = np.array(all_points)
+            # Add new points layer: the per-file blocks are already
+            # float32, so this is one copy into the final array
+            points_array = np.concatenate(all_points)
             properties_dict = {
                 'event_type': [prop['event_type'] for prop in all_properties],
                 'timepoint': [prop['timepoint'] for prop in all_properties],
@@ -375,7 +511,7 @@ def load_dynamics_events_layer(viewer, current_timepoint=None):
                 name="Dynamic Events"
             )
 
-            show_info(f"Loaded {len(all_points)} dynamic events for timepoint {current_timepoint if current_timepoint else 'all'}")
+            show_info(f"Loaded {len(points_array)} dynamic events for timepoint {current_timepoint if current_timepoint else 'all'}")
             return True
 
     except Exception as e:
@@ -385,6 +521,15 @@ def load_dynamics_events_layer(viewer, current_timepoint=None):
     return False
 
 
+def _read_and_extract(csv_path, config, current_timepoint, csv_file):
+    """Read one event CSV and extract its points (thread-pool worker)."""
+    df = pd.read_csv(csv_path)
+    if df.empty:
+        return [], [], []
+    # Extract points and filter by timepoint if specified
+    return extract_event_points(df, config, current_timepoint, csv_file)
+
+
 def extract_event_points(df, config, current_timepoint=None, csv_file=None):
     """
     Extract points from event DataFrame based on event type structure.
@@ -402,55 +547,61 @@ def extract_event_points(df, config, current_timepoint=None, csv_file=None):
     colors = []
     properties = []
 
-    for row_idx, row in df.iterrows():
-        event_points = []
-        event_timepoint = None
-
-        # Handle different event structures - always use timepoint_2
-        if 'position_t1' in row and 'position_t2' in row:
-            # Events with two timepoints (tip-edge fusion, junction breakage)
-            if 'timepoint_2' in row:
-                timepoint_2 = row['timepoint_2']
-                if current_timepoint is None or current_timepoint == timepoint_2:
-                    pos_2 = parse_position(row['position_t2'])
-                    if pos_2:
-                        event_points.append(pos_2)
-                        event_timepoint = timepoint_2
-
-        elif 'tip1_position' in row and 'tip2_position' in row:
-            # Tip-tip events
-            if 'timepoint_2' in row:
-                timepoint_2 = row['timepoint_2']
-                if current_timepoint is None or current_timepoint == timepoint_2:
-                    pos_1 = parse_position(row['tip1_position'])
-                    pos_2 = parse_position(row['tip2_position'])
-                    if pos_1 and pos_2:
-                        event_points.extend([pos_1, pos_2])
-                        event_timepoint = timepoint_2
-
-        elif 'tip_position' in row and 'junction_position' in row:
-            # Extrusion/retraction events
-            if 'timepoint_2' in row:
-                timepoint_2 = row['timepoint_2']
-                if current_timepoint is None or current_timepoint == timepoint_2:
-                    tip_pos = parse_position(row['tip_position'])
-                    junction_pos = parse_position(row['junction_position'])
-                    if tip_pos and junction_pos:
-                        event_points.extend([tip_pos, junction_pos])
-                        event_timepoint = timepoint_2
-
-        # Add points to lists
-        for point in event_points:
-            points.append(point)
+    # Handle different event structures - always use timepoint_2
+    cols = df.columns
+    if 'timepoint_2' not in cols:
+        return points, colors, properties
+
+    # Which position columns this schema carries, in the order their
+    # points are emitted per event
+    if 'position_t1' in cols and 'position_t2' in cols:
+        # Events with two timepoints (tip-edge fusion, junction breakage)
+        pos_cols = ['position_t2']
+    elif 'tip1_position' in cols and 'tip2_position' in cols:
+        # Tip-tip events
+        pos_cols = ['tip1_position', 'tip2_position']
+    elif 'tip_position' in cols and 'junction_position' in cols:
+        # Extrusion/retraction events
+        pos_cols = ['tip_position', 'junction_position']
+    else:
+        return points, colors, properties
+
+    # Filter to the requested timepoint up front, then walk raw column
+    # arrays; iterrows boxed every row into a Series just to read a few
+    # cells from it
+    if current_timepoint is not None:
+        df = df[df['timepoint_2'] == current_timepoint]
+    if df.empty:
+        return points, colors, properties
+
+    row_indices = list(df.index)
+    timepoints = df['timepoint_2'].to_numpy()
+    parsed_cols = [[parse_position(v) for v in df[c].to_numpy()]
+                   for c in pos_cols]
+
+    # One contiguous float32 block sized for every candidate point,
+    # filled by slice assignment and truncated past the last valid row;
+    # appending per-point lists allocated the coordinates twice
+    n_cols = len(pos_cols)
+    points = np.empty((len(row_indices) * n_cols, 3), dtype=np.float32)
+    write = 0
+    for k in range(len(row_indices)):
+        event_points = [col[k] for col in parsed_cols]
+        if any(p is None for p in event_points):
+            continue
+
+        points[write:write + n_cols] = event_points
+        write += n_cols
+        for _ in range(n_cols):
             colors.append(config['color'])
             properties.append({
                 'event_type': config['name'],
-                'timepoint': event_timepoint,
-                'csv_row_index': row_idx,
+                'timepoint': timepoints[k],
+                'csv_row_index': row_indices[k],
                 'csv_file': csv_file
             })
 
-    return points, colors, properties
+    return points[:write], colors, properties
 
 
 def parse_position(position):
@@ -465,6 +616,14 @@ def parse_position(position):
     """
     try:
         if isinstance(position, str):
+            # Fast path for the common "[z, y, x]" string: strip the
+            # brackets and split, which skips compiling a Python AST
+            # per cell; anything fancier falls back to literal_eval
+            try:
+                parts = position.strip().strip('[]()').split(',')
+                return [float(parts[2]), float(parts[1]), float(parts[0])]
+            except (ValueError, IndexError):
+                pass
             # Handle string representation of list
             import ast
             position = ast.literal_eval(position)
@@ -7,6 +7,10 @@ Created on Mon Mar 10 17:13:31 2025
 """
 import re
 
+# Compiled once; re.split would look the pattern up in re's cache on
+# every call, and this parser runs per cell over whole CSV columns
+_POS_RE = re.compile(r'[ \[\],]')
+
 def get_float_pos_comma(st):
     """Parse string representation of position to get coordinates.
 
@@ -16,6 +20,4 @@ def get_float_pos_comma(st):
     Returns:
         list: List of integer coordinates
     """
-    st = re.split(r'[ \[\,\]]', st)
-    pos = [int(element) for element in st if element != '']
-    return pos
\ No newline at end of file
+    return list(map(int, filter(None, _POS_RE.split(st))))
\ No newline at end of file